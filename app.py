@@ -1,113 +1,45 @@
+import contextlib
 import streamlit as st
-import requests
-import pdfplumber
-import re
 import urllib.parse
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+
+# job_find loads its submodules on first attribute access: pdfplumber only
+# when a resume is uploaded, the feed and vectorizer only on the first search
+import job_find
+from job_find import metrics
+from job_find.config import MATCHER, MATCHERS, RESUME_CACHE_SIZE, SHARE_RESUME_CACHE
+from job_find.utils import LRUCache
 
 # --------------------------------------------------
 # CONFIG
 # --------------------------------------------------
 st.set_page_config(page_title="Live Job Finder", layout="wide")
 
-COMMON_SKILLS = [
-    "python", "java", "javascript", "react", "django", "fastapi",
-    "machine learning", "data science", "sql", "mongodb", "node"
-]
-
 if "bookmarks" not in st.session_state:
     st.session_state.bookmarks = []
 
+# Every rerun is one request: the debug panel shows the stages it ran
+recorder = metrics.begin_request()
+debug = st.sidebar.checkbox("Debug timings", help="Time each stage of this run and trace its allocations")
+# Allocations are traced only around this session's own debug runs
+traced = metrics.track_allocations if debug else contextlib.nullcontext
+
 # --------------------------------------------------
 # UTILITIES
 # --------------------------------------------------
 
 
-SALARY_DATA = {
-    "junior software engineer": 60000,
-    "software engineer": 80000,
-    "senior software engineer": 110000,
-    "backend developer": 90000,
-    "full stack developer": 95000,
-    "machine learning engineer": 120000,
-    "data scientist": 115000,
-    "devops engineer": 105000,
-    "frontend developer": 85000,
-    "cloud architect": 130000
-}
-
-def ai_estimate_salary(job_title):
-    titles = list(SALARY_DATA.keys())
-    salaries = np.array(list(SALARY_DATA.values()))
-
-    vectorizer = TfidfVectorizer(stop_words="english")
-    vectors = vectorizer.fit_transform([job_title] + titles)
-
-    similarities = cosine_similarity(vectors[0:1], vectors[1:]).flatten()
-    best_match_idx = similarities.argmax()
-
-    estimated_salary = salaries[best_match_idx]
-
-    # Convert to range
-    low = int(estimated_salary * 0.85)
-    high = int(estimated_salary * 1.15)
-
-    return f"${low//1000}k – ${high//1000}k"
-
-
-def parse_resume(file):
-    text = ""
-    with pdfplumber.open(file) as pdf:
-        for page in pdf.pages:
-            if page.extract_text():
-                text += page.extract_text().lower()
-
-    skills = [s for s in COMMON_SKILLS if s in text]
-    exp = re.findall(r'(\d+)\s+years?', text)
-
-    return {
-        "skills": skills or ["developer"],
-        "experience": exp[0] if exp else "Not specified",
-        "location": "Anywhere"
-    }
-
-
-@st.cache_data(ttl=600)
-def fetch_remotive_raw():
-    try:
-        res = requests.get("https://remotive.io/api/remote-jobs", timeout=10)
-        if res.status_code == 200:
-            return res.json().get("jobs", [])
-    except Exception:
-        pass
-    return []
+@st.cache_resource
+def get_shared_resume_cache():
+    return LRUCache(RESUME_CACHE_SIZE, name="resume")
 
 
-def semantic_match_jobs(skills, jobs, limit=30):
-    user_text = " ".join(skills)
-    job_texts = [
-        job.get("title", "") + " " + job.get("description", "")
-        for job in jobs
-    ]
-
-    vectorizer = TfidfVectorizer(stop_words="english")
-    vectors = vectorizer.fit_transform([user_text] + job_texts)
-    scores = cosine_similarity(vectors[0:1], vectors[1:]).flatten()
-
-    results = []
-    for job, score in zip(jobs, scores):
-        results.append({
-            "title": job["title"],
-            "company": job["company_name"],
-            "location": job["candidate_required_location"],
-            "url": job["url"],
-            "score": round(float(score), 2),
-            "salary": ai_estimate_salary(job["title"])
-        })
-
-    return sorted(results, key=lambda x: x["score"], reverse=True)[:limit]
+def get_resume_cache():
+    # Per session by default; one process-wide cache when sharing is enabled
+    if SHARE_RESUME_CACHE:
+        return get_shared_resume_cache()
+    if "resume_cache" not in st.session_state:
+        st.session_state.resume_cache = LRUCache(RESUME_CACHE_SIZE, name="resume")
+    return st.session_state.resume_cache
 
 
 def linkedin_search(skills, location):
@@ -139,7 +71,8 @@ if method == "Manual Input":
 else:
     resume = st.file_uploader("Upload Resume (PDF)", type=["pdf"])
     if resume:
-        parsed = parse_resume(resume)
+        with traced():
+            parsed = job_find.parse_resume_cached(resume.getvalue(), get_resume_cache())
         skills = parsed["skills"]
         location = parsed["location"]
         st.info(f"Extracted skills: {', '.join(skills)}")
@@ -150,42 +83,55 @@ if not skills:
 # Filters
 min_score = st.slider("Minimum relevance score", 0.0, 1.0, 0.1)
 keyword_filter = st.text_input("Must include keyword (optional)")
+matcher = st.sidebar.selectbox(
+    "Matcher", MATCHERS, index=MATCHERS.index(MATCHER),
+    help="tfidf matches exact words; dense also matches abbreviations and near-spellings; "
+    "hashing ranks like tfidf but takes new postings without refitting",
+)
 
 # --------------------------------------------------
 # SEARCH
 # --------------------------------------------------
 
 if st.button("🚀 Find Jobs"):
-    with st.spinner("Matching jobs intelligently..."):
-        raw_jobs = fetch_remotive_raw()
-        matched = semantic_match_jobs(skills, raw_jobs)
-
-    st.success(f"Showing {len(matched)} jobs")
-
-    for job in matched:
-        if job["score"] < min_score:
-            continue
-        if keyword_filter and keyword_filter.lower() not in job["title"].lower():
-            continue
-
-        col1, col2 = st.columns([4, 1])
-
-        with col1:
-            st.markdown(f"""
-            ### {job['title']}
-            **Company:** {job['company']}  
-            **Location:** {job['location']}  
-            **Relevance Score:** {job['score']}  
-            **Estimated Salary:** {job['salary']}  
-
-            👉 [Apply Here]({job['url']})
-            """)
-
-        with col2:
-            if st.button("⭐ Save", key=job["url"]):
-                st.session_state.bookmarks.append(job)
-
-        st.divider()
+    with traced(), st.spinner("Matching jobs intelligently..."):
+        with metrics.stage("snapshot"):
+            snapshot = job_find.get_feed_refresher().current(matcher)
+        table = snapshot.table
+        rows, scores = job_find.match_rows(
+            skills,
+            snapshot,
+            min_score=min_score,
+            keywords=[keyword_filter] if keyword_filter else None,
+        )
+        salaries = job_find.estimate_salaries(table.titles[rows])
+
+    st.success(f"Showing {len(rows)} jobs")
+
+    with traced(), metrics.stage("render"):
+        for row, score, salary in zip(rows, scores, salaries):
+            job = table.row(row)
+            job["score"] = round(float(score), 2)
+            job["salary"] = salary
+
+            col1, col2 = st.columns([4, 1])
+
+            with col1:
+                st.markdown(f"""
+                ### {job['title']}
+                **Company:** {job['company']}  
+                **Location:** {job['location']}  
+                **Relevance Score:** {job['score']}  
+                **Estimated Salary:** {job['salary']}  
+
+                👉 [Apply Here]({job['url']})
+                """)
+
+            with col2:
+                if st.button("⭐ Save", key=job["url"]):
+                    st.session_state.bookmarks.append(job)
+
+            st.divider()
 
     # External Platforms
     st.subheader("🔗 Search More")
@@ -200,3 +146,27 @@ if st.session_state.bookmarks:
     st.subheader("⭐ Saved Jobs")
     for job in st.session_state.bookmarks:
         st.markdown(f"- **{job['title']}** at {job['company']}")
+
+# --------------------------------------------------
+# DEBUG
+# --------------------------------------------------
+
+if debug:
+    with st.sidebar:
+        st.subheader("This run")
+        st.dataframe(
+            [
+                {
+                    "stage": event["stage"],
+                    "wall ms": round(event["wall_ms"], 1),
+                    "cpu ms": round(event["cpu_ms"], 1),
+                    "alloc peak KiB": round((event["alloc_peak_bytes"] or 0) / 1024, 1),
+                }
+                for event in recorder.events
+            ],
+            hide_index=True,
+        )
+        if recorder.counters:
+            st.json(recorder.counters)
+        with st.expander("Process totals (Prometheus)"):
+            st.code(metrics.render_prometheus(), language="text")
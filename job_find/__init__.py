@@ -0,0 +1,58 @@
+import importlib
+
+# Public names and the submodule that defines each. Submodules (and the heavy
+# libraries behind them: numpy, scikit-learn, pdfplumber, requests) are only
+# imported when one of their names is first used, so `import job_find` and
+# the first paint of the Streamlit app stay cheap.
+_EXPORTS = {
+    "DenseIndex": "embedding",
+    "FeedSnapshot": "index",
+    "JobIndex": "index",
+    "as_snapshot": "index",
+    "get_job_index": "index",
+    "batch_match_jobs": "matching",
+    "match_rows": "matching",
+    "semantic_match_jobs": "matching",
+    "top_k": "matching",
+    "top_k_rows": "matching",
+    "COMMON_SKILLS": "resume",
+    "SkillMatcher": "resume",
+    "extract_resume_text": "resume",
+    "find_skills": "resume",
+    "ingest_resumes": "resume",
+    "parse_resume": "resume",
+    "parse_resume_cached": "resume",
+    "SALARY_DATA": "salary",
+    "SalaryEstimator": "salary",
+    "ai_estimate_salary": "salary",
+    "estimate_salaries": "salary",
+    "JobSource": "sources",
+    "RemotiveSource": "sources",
+    "fetch_all_sources": "sources",
+    "fetch_jobs": "sources",
+    "normalize_jobs": "sources",
+    "prepare_jobs": "sources",
+    "FeedRefresher": "store",
+    "SnapshotStore": "store",
+    "get_feed_refresher": "store",
+    "load_snapshot": "store",
+    "refresh_snapshot": "store",
+    "JobTable": "table",
+    "clean_text": "text",
+    "html_to_text": "text",
+    "LRUCache": "utils",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
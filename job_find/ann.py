@@ -0,0 +1,87 @@
+import numpy as np
+
+from .config import ANN_NPROBE
+from .metrics import stage
+
+# Inverted-file (IVF) index over L2-normalized vectors, in plain numpy.
+# Spherical k-means splits the rows into about sqrt(n) lists; a search scores
+# the centroids, then only the rows of the `nprobe` closest lists. nprobe is
+# the recall/latency dial: more lists probed, closer to exact search. It is
+# a search-time setting (ANN_NPROBE by default), not part of the index.
+
+
+def spherical_kmeans(vectors, n_lists, iterations=10, seed=0):
+    from scipy import sparse
+
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        members = sparse.csr_matrix(
+            (np.ones(len(vectors), dtype=np.float32), (assign, np.arange(len(vectors)))),
+            shape=(n_lists, len(vectors)),
+        )
+        sums = np.asarray(members @ vectors, dtype=np.float32)
+        # Lists that lost every member restart from a random row
+        empty = np.flatnonzero(np.asarray(members.sum(axis=1)).ravel() == 0)
+        sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0)
+    return centroids
+
+
+def assign_lists(vectors, centroids, chunk=65536):
+    return np.concatenate([
+        np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1).astype(np.int32)
+        for start in range(0, len(vectors), chunk)
+    ]) if len(vectors) else np.empty(0, dtype=np.int32)
+
+
+class IVFIndex:
+    def __init__(self, centroids, assign):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.assign = np.asarray(assign, dtype=np.int32)
+        # Row ids grouped by list; list l is order[offsets[l]:offsets[l + 1]]
+        self.order = np.argsort(self.assign, kind="stable").astype(np.int32)
+        self.offsets = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.assign, minlength=len(self.centroids)), out=self.offsets[1:])
+
+    @classmethod
+    @stage("build_ann")
+    def build(cls, vectors, n_lists=None, sample_per_list=64, seed=0):
+        # Centroids are trained on a sample; every row is then assigned
+        n_lists = min(n_lists or max(int(np.sqrt(len(vectors))), 1), len(vectors))
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), n_lists * sample_per_list)
+        sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        centroids = spherical_kmeans(np.asarray(sample, dtype=np.float32), n_lists, seed=seed)
+        return cls(centroids, assign_lists(vectors, centroids))
+
+    def extend(self, vectors):
+        # Appended rows join their nearest existing list; the centroids are
+        # retrained with the next full rebuild
+        return IVFIndex(self.centroids, np.concatenate([self.assign, assign_lists(vectors, self.centroids)]))
+
+    def probe(self, query_vector, nprobe):
+        centroid_scores = self.centroids @ query_vector
+        if nprobe < len(self.centroids):
+            lists = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            lists = np.arange(len(self.centroids))
+        return np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in lists])
+
+    def search(self, vectors, query_vector, limit, mask=None, min_score=0.0, nprobe=None):
+        # Candidate rows and their exact scores, unsorted. When the mask or
+        # min_score leave fewer than `limit` candidates, twice as many lists
+        # are probed until the page fills up or every list has been seen.
+        nprobe = min(nprobe or ANN_NPROBE, len(self.centroids))
+        while True:
+            rows = self.probe(query_vector, nprobe)
+            if mask is not None:
+                rows = rows[mask[rows]]
+            scores = vectors[rows] @ query_vector
+            keep = np.round(scores, 2) >= min_score
+            rows, scores = rows[keep], scores[keep]
+            if len(rows) >= limit or nprobe >= len(self.centroids):
+                return rows, scores
+            nprobe = min(nprobe * 2, len(self.centroids))
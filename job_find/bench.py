@@ -0,0 +1,328 @@
+import io
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Offline benchmark of the matching pipeline over synthetic, Remotive-shaped
+# feeds. Every stage is timed over several runs (latency percentiles and
+# throughput) and then run once more under tracemalloc for peak memory.
+
+TITLES = [
+    "Senior Python Engineer", "Backend Developer", "Full Stack Developer",
+    "Frontend Developer (React)", "Machine Learning Engineer", "Data Scientist",
+    "DevOps Engineer", "Cloud Architect", "Junior Software Engineer",
+    "Site Reliability Engineer", "Data Engineer", "Mobile Developer (iOS)",
+    "Product Manager", "Customer Support Specialist", "QA Automation Engineer",
+]
+LOCATIONS = ["Worldwide", "USA", "Europe", "UK", "Canada", "LATAM", "Germany", "Americas"]
+WORDS = (
+    "python java javascript typescript react django fastapi flask node sql postgres "
+    "mongodb redis kafka spark airflow aws gcp azure docker kubernetes terraform linux "
+    "machine learning data science pipelines api microservices testing ci cd team remote "
+    "collaborate build scalable reliable product customers ownership mentor design review "
+    "async communication startup growth benefits equity flexible hours we you our"
+).split()
+SKILL_QUERIES = [
+    ["python", "django"], ["react", "javascript"], ["machine learning", "python"],
+    ["aws", "kubernetes", "terraform"], ["sql", "data science"], ["java", "kafka"],
+    ["node", "mongodb"], ["docker", "linux"],
+]
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def synthetic_description(rng, topic=WORDS):
+    # Remotive descriptions are HTML blobs of a few thousand characters. Half
+    # the words come from the posting's topic, so postings for the same kind
+    # of role cluster together the way real ones do.
+    n_words = max(int(rng.lognormvariate(math.log(450), 0.5)), 40)
+    words = [rng.choice(topic if rng.random() < 0.5 else WORDS) for _ in range(n_words)]
+    paragraphs = [" ".join(words[i:i + 60]) for i in range(0, n_words, 60)]
+    items = "".join(f"<li>{rng.choice(WORDS).title()} &amp; {rng.choice(WORDS)}</li>" for _ in range(6))
+    return "".join(f"<p>{p}.</p>" for p in paragraphs) + f"<ul>{items}</ul>"
+
+
+def synthetic_jobs(n, seed=0):
+    rng = random.Random(seed)
+    topics = {title: random.Random(title).sample(WORDS, 12) for title in TITLES}
+    titles = [rng.choice(TITLES) for _ in range(n)]
+    return [
+        {
+            "id": 1_000_000 + i,
+            "url": f"https://remotive.com/remote-jobs/software-dev/job-{1_000_000 + i}",
+            "title": titles[i],
+            "company_name": f"Company {rng.randrange(max(n // 20, 10))}",
+            "company_logo": f"https://remotive.com/job/{i}/logo",
+            "category": "Software Development",
+            "tags": rng.sample(WORDS, 5),
+            "job_type": rng.choice(["full_time", "contract"]),
+            "publication_date": "2026-10-01T12:00:00",
+            "candidate_required_location": rng.choice(LOCATIONS),
+            "salary": "",
+            "description": synthetic_description(rng, topics[titles[i]]),
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_feed(n, seed=0):
+    return json.dumps({"job-count": n, "jobs": synthetic_jobs(n, seed)}).encode()
+
+
+def synthetic_resume_pdf(pages=2, seed=0):
+    # A minimal but valid PDF with one text block per page, built by hand so
+    # the benchmark needs no PDF writer
+    rng = random.Random(seed)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in range(pages):
+        lines = [f"Candidate {seed} - page {page + 1}", f"{rng.randint(1, 15)} years of experience"]
+        lines += [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(30)]
+        stream = "BT /F1 10 Tf 40 800 Td 12 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        kids.append(f"{len(objects) + 1} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects) + 2} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+class _FeedResponse:
+    # Stands in for a streamed requests.Response in RemotiveSource.parse
+    def __init__(self, body):
+        self.raw = io.BytesIO(body)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    rank = (len(values) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def measure(stage, size, func, items, repeat):
+    # func() runs the stage once; `items` is how many jobs/queries/files one
+    # run processes, for throughput
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "stage": stage,
+        "size": size,
+        "runs": repeat,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "throughput_per_s": items / (sum(timings) / len(timings)),
+        "peak_mem_mb": peak / 2**20,
+    }
+
+
+def measure_calls(stage, size, calls, repeat):
+    # Latency percentiles over individual calls (one query each), rather
+    # than over whole runs
+    timings = []
+    for _ in range(repeat):
+        for call in calls:
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        for call in calls:
+            call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "stage": stage,
+        "size": size,
+        "runs": repeat,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "throughput_per_s": len(timings) / sum(timings),
+        "peak_mem_mb": peak / 2**20,
+    }
+
+
+def bench_ann(index, size, nprobes, queries=200, limit=30, repeat=3, seed=0):
+    # Recall@limit and per-query latency of IVF search at each nprobe,
+    # against exact search over the same dense vectors
+    from .ann import IVFIndex
+    from .matching import top_k
+
+    rng = random.Random(seed)
+    texts = [" ".join(rng.sample(WORDS, rng.randint(2, 4))) for _ in range(queries)]
+    query_vectors = index.encode(texts)[0]
+    matrix = index.matrix
+    exact = [set(top_k(matrix @ q, limit)) for q in query_vectors]
+
+    results = [
+        measure_calls("exact_search", size, [lambda q=q: top_k(matrix @ q, limit) for q in query_vectors], repeat),
+        measure("build_ann", size, lambda: IVFIndex.build(matrix), size, repeat),
+    ]
+    ann = IVFIndex.build(matrix)
+    for nprobe in nprobes:
+        def search(q, nprobe=nprobe):
+            rows, scores = ann.search(matrix, q, limit, min_score=-math.inf, nprobe=nprobe)
+            return rows[top_k(scores, limit)]
+
+        recall = sum(len(expected.intersection(search(q))) / len(expected)
+                     for q, expected in zip(query_vectors, exact)) / len(exact)
+        result = measure_calls("ann_search", size, [lambda q=q: search(q) for q in query_vectors], repeat)
+        result["nprobe"] = nprobe
+        result["k"] = limit
+        result["recall_at_k"] = recall
+        results.append(result)
+    for result in results:
+        result["matcher"] = "dense"
+    return results
+
+
+def bench_size(size, repeat=3, queries=50, seed=0, matchers=("tfidf",), ann_nprobes=()):
+    from .index import FeedSnapshot
+    from .matching import batch_match_jobs, semantic_match_jobs
+    from .salary import ai_estimate_salary, estimate_salaries
+    from .sources import RemotiveSource, prepare_jobs
+    from .table import JobTable
+
+    source = RemotiveSource(url="offline://")
+    body = synthetic_feed(size, seed)
+    jobs = source.parse(_FeedResponse(body))
+    prepared = prepare_jobs(jobs)
+    table = JobTable.from_jobs(prepared)
+    rng = random.Random(seed)
+    query_list = [rng.choice(SKILL_QUERIES) for _ in range(queries)]
+    titles = list(table.titles[:min(size, 1000)])
+
+    results = [
+        measure("parse_feed", size, lambda: source.parse(_FeedResponse(body)), size, repeat),
+        measure("prepare_text", size, lambda: prepare_jobs(jobs), size, repeat),
+        measure("build_table", size, lambda: JobTable.from_jobs(prepared), size, repeat),
+        measure_calls("salary_single", size, [lambda title=title: ai_estimate_salary(title) for title in titles], repeat),
+        measure("salary_batch", size, lambda: estimate_salaries(table.titles), size, repeat),
+    ]
+    for matcher in matchers:
+        snapshot = FeedSnapshot.build(table, matcher)
+        matcher_results = [
+            measure("build_index", size, lambda: FeedSnapshot.build(table, matcher), size, repeat),
+            measure_calls("match_query", size,
+                          [lambda skills=skills: semantic_match_jobs(skills, snapshot) for skills in query_list],
+                          repeat),
+            measure("batch_match", size, lambda: batch_match_jobs(query_list, snapshot), queries, repeat),
+        ]
+        matcher_results[0]["index_mb"] = snapshot.index.nbytes() / 2**20
+        for result in matcher_results:
+            result["matcher"] = matcher
+        results += matcher_results
+        if matcher == "dense" and ann_nprobes:
+            results += bench_ann(snapshot.index, size, ann_nprobes, repeat=repeat, seed=seed)
+    return results
+
+
+def bench_resumes(count=20, pages=2, repeat=3):
+    from .resume import parse_resume
+
+    pdfs = [synthetic_resume_pdf(pages, seed) for seed in range(count)]
+    result = measure_calls("parse_resume", count, [lambda pdf=pdf: parse_resume(io.BytesIO(pdf)) for pdf in pdfs],
+                           repeat)
+    result["pages"] = pages
+    return result
+
+
+def run_benchmarks(sizes=None, repeat=3, queries=50, resumes=20, matchers=("tfidf",), ann_nprobes=(),
+                   out=sys.stdout):
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        for result in bench_size(size, repeat=repeat, queries=queries, matchers=matchers, ann_nprobes=ann_nprobes):
+            results.append(result)
+            print_result(result, out)
+    if resumes:
+        result = bench_resumes(count=resumes, repeat=repeat)
+        results.append(result)
+        print_result(result, out)
+    return {
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def stage_label(result):
+    if "nprobe" in result:
+        return f"{result['stage']}[{result['matcher']},nprobe={result['nprobe']}]"
+    return f"{result['stage']}[{result['matcher']}]" if "matcher" in result else result["stage"]
+
+
+def print_result(result, out):
+    print(
+        f"{stage_label(result):<28} n={result['size']:<7} "
+        f"p50={result['p50_ms']:9.2f}ms p95={result['p95_ms']:9.2f}ms p99={result['p99_ms']:9.2f}ms "
+        f"{result['throughput_per_s']:12.1f}/s peak={result['peak_mem_mb']:8.1f}MB"
+        + (f" index={result['index_mb']:.1f}MB" if "index_mb" in result else "")
+        + (f" recall@{result['k']}={result['recall_at_k']:.3f}" if "recall_at_k" in result else ""),
+        file=out,
+    )
+
+
+def compare(report, baseline, tolerance=0.2, out=sys.stdout):
+    # Flags stages whose p50 latency or peak memory grew, or whose ANN recall
+    # fell, by more than `tolerance` against a saved report; returns the list
+    # of regressions
+    previous = {(stage_label(r), r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get((stage_label(result), result["size"]))
+        if before is None:
+            continue
+        for key in ("p50_ms", "peak_mem_mb", "recall_at_k"):
+            if key not in before or key not in result:
+                continue
+            if key == "recall_at_k":
+                regressed = result[key] < before[key] * (1 - tolerance)
+            else:
+                regressed = before[key] > 0 and result[key] > before[key] * (1 + tolerance)
+            if regressed:
+                regressions.append((stage_label(result), result["size"], key, before[key], result[key]))
+                print(
+                    f"REGRESSION {stage_label(result)} n={result['size']} {key}: "
+                    f"{before[key]:.2f} -> {result[key]:.2f}",
+                    file=out,
+                )
+    return regressions
@@ -0,0 +1,169 @@
+import argparse
+import json
+import logging
+import sys
+
+from .config import FEED_TTL, MATCHER, MATCHERS
+
+# Command implementations import the heavy modules themselves, so `--help`
+# and `importtime` do not pay for numpy, scikit-learn or pdfplumber.
+
+
+def split_skills(value):
+    return [s.strip().lower() for s in value.split(",") if s.strip()]
+
+
+def print_matches(matches, as_json):
+    if as_json:
+        json.dump(matches, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return
+    for job in matches:
+        print(f"{job['score']:.2f}  {job['title']} — {job['company']} ({job['location']})  {job['salary']}")
+        print(f"      {job['url']}")
+
+
+def cmd_match(args):
+    from .matching import semantic_match_jobs
+    from .resume import parse_resume
+    from .store import load_snapshot
+
+    skills = split_skills(args.skills or "")
+    if args.resume:
+        skills += parse_resume(args.resume)["skills"]
+    snapshot = load_snapshot(max_age=args.max_age, matcher=args.matcher)
+    matches = semantic_match_jobs(
+        skills or ["developer"],
+        snapshot,
+        limit=args.limit,
+        min_score=args.min_score,
+        keywords=args.keyword,
+    )
+    print_matches(matches, args.json)
+    return 0
+
+
+def cmd_ingest(args):
+    from .matching import batch_match_jobs
+    from .resume import ingest_resumes
+    from .store import load_snapshot
+
+    if not args.match:
+        # One JSON object per line, written as each file finishes
+        for result in ingest_resumes(args.path, workers=args.workers, timeout=args.timeout):
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+        return 0
+
+    parsed = [r for r in ingest_resumes(args.path, workers=args.workers, timeout=args.timeout) if r["profile"]]
+    snapshot = load_snapshot(max_age=args.max_age, matcher=args.matcher)
+    shortlists = batch_match_jobs(
+        [r["profile"] for r in parsed], snapshot, limit=args.limit, min_score=args.min_score
+    )
+    for result, matches in zip(parsed, shortlists):
+        print(json.dumps({"file": result["file"], "profile": result["profile"], "matches": matches},
+                         ensure_ascii=False), flush=True)
+    return 0
+
+
+def cmd_refresh(args):
+    from .store import get_snapshot_store, refresh_snapshot
+
+    store = get_snapshot_store()
+    snapshot = refresh_snapshot(store, store.load_latest(), args.matcher)
+    print(f"{int(snapshot.table.alive.sum())} jobs in snapshot {snapshot.table.fingerprint[:12]}")
+    return 0 if len(snapshot.table) else 1
+
+
+def cmd_importtime(args):
+    from .importtime import check_import_budget
+
+    return 0 if check_import_budget(args.module, budget_ms=args.budget_ms, top=args.top) else 1
+
+
+def cmd_bench(args):
+    from .bench import compare, run_benchmarks
+
+    report = run_benchmarks(args.sizes, repeat=args.repeat, queries=args.queries, resumes=args.resumes,
+                            matchers=args.matchers, ann_nprobes=args.ann_nprobe)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, tolerance=args.tolerance):
+            return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="job_find", description="Match skills and resumes against live job feeds.")
+    parser.add_argument("--metrics", choices=["log", "prometheus"],
+                        help="log one JSON line per timed stage, or print stage totals and cache counters at exit "
+                             "(both to stderr)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    match = commands.add_parser("match", help="rank jobs for a skill list or a resume")
+    match.add_argument("--skills", help="comma separated skills")
+    match.add_argument("--resume", help="PDF resume to take skills from")
+    match.add_argument("--keyword", action="append", help="keyword every title must contain (repeatable)")
+    match.set_defaults(func=cmd_match)
+
+    ingest = commands.add_parser("ingest", help="parse a PDF, or a directory or .zip of PDF resumes, in parallel")
+    ingest.add_argument("path")
+    ingest.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    ingest.add_argument("--timeout", type=float, default=30, help="seconds allowed per file")
+    ingest.add_argument("--match", action="store_true", help="also shortlist jobs for every parsed resume")
+    ingest.set_defaults(func=cmd_ingest)
+
+    for command in (match, ingest):
+        command.add_argument("--limit", type=int, default=30)
+        command.add_argument("--min-score", type=float, default=0.0)
+        command.add_argument("--max-age", type=float, default=FEED_TTL,
+                             help="refresh the feed snapshot if it is older than this many seconds")
+    match.add_argument("--json", action="store_true", help="print results as JSON")
+
+    refresh = commands.add_parser("refresh", help="fetch the job feeds and update the snapshot on disk")
+    for command in (match, ingest, refresh):
+        command.add_argument("--matcher", choices=MATCHERS, default=MATCHER,
+                             help=f"scoring backend (default: {MATCHER}, set by JOB_FIND_MATCHER)")
+    refresh.set_defaults(func=cmd_refresh)
+
+    importtime = commands.add_parser("importtime", help="report import cost per package against a budget")
+    importtime.add_argument("module", nargs="*", help="modules to import (default: job_find, job_find.cli)")
+    importtime.add_argument("--budget-ms", type=float, default=150)
+    importtime.add_argument("--top", type=int, default=10)
+    importtime.set_defaults(func=cmd_importtime)
+
+    bench = commands.add_parser("bench", help="benchmark the pipeline offline on synthetic feeds and resumes")
+    bench.add_argument("--sizes", type=int, nargs="+", help="feed sizes (default: 1000 10000 100000)")
+    bench.add_argument("--repeat", type=int, default=3, help="timed runs per stage")
+    bench.add_argument("--queries", type=int, default=50, help="skill queries per matching run")
+    bench.add_argument("--matchers", nargs="+", choices=MATCHERS, default=list(MATCHERS),
+                       help="scoring backends to compare (default: all)")
+    bench.add_argument("--ann-nprobe", type=int, nargs="+", default=[],
+                       help="with the dense matcher, also compare IVF search at these nprobe values with exact search")
+    bench.add_argument("--resumes", type=int, default=20, help="synthetic PDFs to parse (0 to skip)")
+    bench.add_argument("--out", help="write the JSON report here")
+    bench.add_argument("--compare", help="earlier JSON report to check for regressions")
+    bench.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a stage counts as regressed")
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics == "log":
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        metrics_logger = logging.getLogger("job_find.metrics")
+        metrics_logger.addHandler(handler)
+        metrics_logger.setLevel(logging.INFO)
+    try:
+        return args.func(args)
+    finally:
+        if args.metrics == "prometheus":
+            from .metrics import render_prometheus
+
+            sys.stderr.write(render_prometheus())
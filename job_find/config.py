@@ -0,0 +1,18 @@
+import os
+
+FEED_TTL = 600
+REMOTIVE_URL = os.environ.get("JOB_FIND_REMOTIVE_URL", "https://remotive.io/api/remote-jobs")
+SNAPSHOT_DIR = os.environ.get(
+    "JOB_FIND_SNAPSHOT_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "job_find", "snapshots"),
+)
+RESUME_CACHE_SIZE = int(os.environ.get("JOB_FIND_RESUME_CACHE_SIZE", "16"))
+SHARE_RESUME_CACHE = os.environ.get("JOB_FIND_SHARE_RESUME_CACHE", "") == "1"
+MATCHERS = ("tfidf", "dense", "hashing")
+MATCHER = os.environ.get("JOB_FIND_MATCHER", "tfidf")
+HASHING_FEATURES = int(os.environ.get("JOB_FIND_HASHING_FEATURES", str(2**20)))
+EMBEDDING_DIM = int(os.environ.get("JOB_FIND_EMBEDDING_DIM", "256"))
+# Dense snapshots this large also get an IVF index; nprobe trades recall
+# for latency
+ANN_MIN_ROWS = int(os.environ.get("JOB_FIND_ANN_MIN_ROWS", "50000"))
+ANN_NPROBE = int(os.environ.get("JOB_FIND_ANN_NPROBE", "16"))
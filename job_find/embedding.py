@@ -0,0 +1,188 @@
+import re
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from .ann import IVFIndex
+from .config import ANN_MIN_ROWS, EMBEDDING_DIM
+from .index import build_token_index, exact_candidates, extend_token_index, title_keyword_mask
+from .metrics import stage
+
+# Abbreviations that postings and resumes use interchangeably with the
+# spelled-out form. Both sides are expanded, so "ML" finds "machine learning"
+# postings and the other way around.
+ABBREVIATIONS = {
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "llm": "large language model",
+    "llms": "large language models",
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "db": "database",
+    "qa": "quality assurance",
+    "sre": "site reliability engineering",
+    "swe": "software engineer",
+    "ui": "user interface",
+    "ux": "user experience",
+    "bi": "business intelligence",
+    "ci": "continuous integration",
+    "cd": "continuous delivery",
+    "gcp": "google cloud platform",
+    "aws": "amazon web services",
+}
+ABBREVIATION_PATTERN = re.compile(r"\b(" + "|".join(map(re.escape, ABBREVIATIONS)) + r")\b")
+
+
+def expand_abbreviations(text):
+    return ABBREVIATION_PATTERN.sub(lambda m: f"{m.group(1)} {ABBREVIATIONS[m.group(1)]}", text.lower())
+
+
+def get_analyzer():
+    # Same tokens and stop words as the TF-IDF matcher, after expansion
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    return CountVectorizer(stop_words="english", preprocessor=expand_abbreviations).build_analyzer()
+
+
+def word_vectors(words, dim):
+    # Fit-free word embeddings: the character 3-5 grams of each word are
+    # hashed with random signs straight into `dim` buckets, which is a sparse
+    # random projection of its n-gram profile. Unrelated words come out
+    # nearly orthogonal; words sharing most n-grams ("postgres",
+    # "postgresql") land close together, including words never seen before.
+    # The result stays sparse: a dense copy would cost `dim` floats per word
+    # of the vocabulary.
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    hasher = HashingVectorizer(
+        analyzer="char_wb", ngram_range=(3, 5), n_features=dim,
+        alternate_sign=True, norm="l2", dtype=np.float32,
+    )
+    return hasher.transform(words)
+
+
+def count_tokens(texts, analyzer, vocabulary):
+    # Token counts per text as a CSR matrix over `vocabulary`, which grows
+    # in place with the tokens it did not know yet
+    from scipy import sparse
+
+    indices, data, indptr = array("q"), array("f"), array("q", [0])
+    add = vocabulary.setdefault
+    for text in texts:
+        counts = Counter(analyzer(text))
+        indices.extend([add(token, len(vocabulary)) for token in counts])
+        data.extend(counts.values())
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (
+            np.frombuffer(data, dtype=np.float32),
+            np.frombuffer(indices, dtype=np.int64),
+            np.frombuffer(indptr, dtype=np.int64),
+        ),
+        shape=(len(texts), len(vocabulary)),
+    )
+
+
+def embed(counts, idf, vectors, chunk=4096):
+    # Sublinear TF-IDF weighted sum of word vectors, L2-normalized per row.
+    # The product is densified a chunk of rows at a time, so no sparse copy
+    # of the whole (nearly full) result is ever held.
+    weights = counts.copy()
+    weights.data = (1 + np.log(weights.data)) * idf[weights.indices]
+    dense = np.empty((weights.shape[0], vectors.shape[1]), dtype=np.float32)
+    for start in range(0, len(dense), chunk):
+        dense[start:start + chunk] = (weights[start:start + chunk] @ vectors).toarray()
+    norms = np.linalg.norm(dense, axis=1, keepdims=True)
+    np.divide(dense, norms, out=dense, where=norms > 0)
+    return dense
+
+
+class DenseIndex:
+    # Dense-vector matcher. Every posting is encoded once per snapshot into
+    # an `EMBEDDING_DIM` vector built from hashed character n-grams, so a
+    # search is one BLAS mat-vec over a float32 matrix (stored as float16 on
+    # disk). Unlike TF-IDF, near-spellings and expanded abbreviations still
+    # match. Past ANN_MIN_ROWS postings, single-query searches go through an
+    # IVF index instead of scoring every row.
+    kind = "dense"
+
+    def __init__(self, terms, idf, matrix, title_tokens, tokens_seen=0, tokens_unknown=0, ann=None):
+        self.terms = list(terms)
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.matrix = np.asarray(matrix, dtype=np.float32)
+        self.title_tokens = title_tokens
+        self.tokens_seen = tokens_seen
+        self.tokens_unknown = tokens_unknown
+        self.ann = ann
+        self._analyzer = None
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            self._analyzer = get_analyzer()
+        return self._analyzer
+
+    @classmethod
+    @stage("build_index")
+    def build(cls, job_texts, titles, dim=EMBEDDING_DIM):
+        vocabulary = {}
+        counts = count_tokens(job_texts, get_analyzer(), vocabulary)
+        df = np.bincount(counts.indices, minlength=len(vocabulary))
+        idf = (np.log((1 + len(job_texts)) / (1 + df)) + 1).astype(np.float32)
+        matrix = embed(counts, idf, word_vectors(list(vocabulary), dim))
+        ann = IVFIndex.build(matrix) if len(matrix) >= ANN_MIN_ROWS else None
+        return cls(list(vocabulary), idf, matrix, build_token_index(titles), ann=ann)
+
+    def encode(self, texts):
+        # Tokens the fitted vocabulary does not know still get a vector, at
+        # the highest IDF weight
+        vocabulary = {}
+        counts = count_tokens(texts, self.analyzer, vocabulary)
+        words = list(vocabulary)
+        unknown_idf = self.idf.max() if len(self.idf) else 1.0
+        idf = np.array([self.idf[self.vocabulary[w]] if w in self.vocabulary else unknown_idf for w in words],
+                       dtype=np.float32)
+        return embed(counts, idf, word_vectors(words, self.matrix.shape[1])), counts, words
+
+    @stage("extend_index")
+    def extend(self, job_texts, titles):
+        vectors, counts, words = self.encode(job_texts)
+        known = np.array([w in self.vocabulary for w in words], dtype=bool)
+        per_word = np.asarray(counts.sum(axis=0)).ravel()
+        return DenseIndex(
+            self.terms,
+            self.idf,
+            np.vstack([self.matrix, vectors]),
+            extend_token_index(self.title_tokens, titles, self.matrix.shape[0]),
+            self.tokens_seen + int(per_word.sum()),
+            self.tokens_unknown + int(per_word[~known].sum()),
+            self.ann.extend(vectors) if self.ann is not None else None,
+        )
+
+    def drift(self):
+        # Unknown tokens are still embedded, but their IDF is a guess
+        return self.tokens_unknown / self.tokens_seen if self.tokens_seen else 0.0
+
+    def score(self, query):
+        return self.matrix @ self.encode([query])[0][0]
+
+    def score_many(self, queries):
+        return self.encode(queries)[0] @ self.matrix.T
+
+    def candidates(self, query, limit, mask, min_score=0.0, nprobe=None):
+        query_vector = self.encode([query])[0][0]
+        if self.ann is None:
+            return exact_candidates(self.matrix @ query_vector, mask, min_score)
+        return self.ann.search(self.matrix, query_vector, limit, mask, min_score, nprobe)
+
+    def keyword_mask(self, keywords, titles):
+        return title_keyword_mask(self.title_tokens, titles, keywords)
+
+    def nbytes(self):
+        ann = self.ann.centroids.nbytes + self.ann.assign.nbytes + self.ann.order.nbytes if self.ann else 0
+        return self.matrix.nbytes + self.idf.nbytes + ann
@@ -0,0 +1,154 @@
+import itertools
+
+import numpy as np
+
+from .config import HASHING_FEATURES
+from .index import exact_candidates, extend_token_index, title_keyword_mask
+from .metrics import stage
+
+# Postings are vectorized this many at a time, which bounds the token lists
+# held in memory while a large feed streams in
+CHUNK_SIZE = 10_000
+
+
+class HashingFeatures:
+    # Fit-free TF-IDF. Tokens are hashed into a fixed number of columns, so
+    # there is no vocabulary to fit or grow, and document frequencies are
+    # counters that every new batch of postings simply adds to.
+    def __init__(self, n_features=HASHING_FEATURES, df=None, n_docs=0):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.hasher = HashingVectorizer(
+            stop_words="english", n_features=n_features, alternate_sign=False, norm=None, dtype=np.float32,
+        )
+        self.n_features = n_features
+        self.df = np.zeros(n_features, dtype=np.int32) if df is None else np.array(df, dtype=np.int32)
+        self.n_docs = n_docs
+        self._idf = None
+
+    def copy(self):
+        return HashingFeatures(self.n_features, self.df, self.n_docs)
+
+    def counts(self, texts):
+        return self.hasher.transform(texts)
+
+    def partial_fit(self, counts):
+        self.df += np.bincount(counts.indices, minlength=self.n_features).astype(np.int32)
+        self.n_docs += counts.shape[0]
+        self._idf = None
+        return counts
+
+    def idf(self):
+        # A log over every column, so computed once per set of frequencies
+        if self._idf is None:
+            self._idf = (np.log((1 + self.n_docs) / (1 + self.df)) + 1).astype(np.float32)
+        return self._idf
+
+    def weight(self, counts):
+        # L2-normalized TF-IDF rows, the same weighting TfidfVectorizer uses
+        from sklearn.preprocessing import normalize
+
+        weighted = counts.copy()
+        weighted.data *= self.idf()[weighted.indices]
+        return normalize(weighted)
+
+    def fit_transform(self, texts):
+        return self.weight(self.partial_fit(self.counts(texts)))
+
+    def transform(self, texts):
+        return self.weight(self.counts(texts))
+
+
+class HashingIndex:
+    # TF-IDF matcher over hashed features. The raw term counts are stored
+    # and IDF is applied at query time: with w = idf**2,
+    #     cosine(d, q) = (D @ (q * w)) / (sqrt(D**2 @ w) * |q * idf|)
+    # so appending postings only adds rows and bumps document frequencies;
+    # nothing is refitted and memory does not grow with the vocabulary.
+    kind = "hashing"
+    ann = None
+    # Every token has a column, so none is ever out of vocabulary
+    tokens_seen = 0
+    tokens_unknown = 0
+
+    def __init__(self, features, matrix, title_tokens):
+        self.features = features
+        self.matrix = matrix
+        self.title_tokens = title_tokens
+        self._weights = None
+        self._norms = None
+
+    @classmethod
+    @stage("build_index")
+    def build(cls, job_texts, titles):
+        from scipy import sparse
+
+        features = HashingFeatures()
+        empty = sparse.csr_matrix((0, features.n_features), dtype=np.float32)
+        return cls(features, empty, {}).extend(job_texts, titles)
+
+    @stage("extend_index")
+    def extend(self, job_texts, titles):
+        # Postings can come from any iterable, e.g. straight off a feed parser.
+        # Document frequencies only ever grow: postings tombstoned since the
+        # last build still count towards IDF until the snapshot's dead-row
+        # threshold forces a rebuild (see FeedSnapshot.update).
+        from scipy import sparse
+
+        features = self.features.copy()
+        parts = [self.matrix]
+        texts = iter(job_texts)
+        while True:
+            chunk = list(itertools.islice(texts, CHUNK_SIZE))
+            if not chunk:
+                break
+            parts.append(features.partial_fit(features.counts(chunk)))
+        matrix = sparse.vstack(parts, format="csr", dtype=np.float32)
+        title_tokens = extend_token_index(self.title_tokens, titles, self.matrix.shape[0])
+        return HashingIndex(features, matrix, title_tokens)
+
+    def drift(self):
+        # New tokens hash into the same columns; there is no vocabulary to
+        # go stale
+        return 0.0
+
+    def query_weights(self):
+        # idf**2 and the row norms under the current IDF, once per index
+        if self._norms is None:
+            idf = self.features.idf()
+            squared = self.matrix.copy()
+            squared.data **= 2
+            self._weights = idf * idf
+            self._norms = np.sqrt(squared @ self._weights)
+        return self._weights, self._norms
+
+    def score_many(self, queries):
+        weights, norms = self.query_weights()
+        counts = self.features.counts(queries)
+        query_norms = np.sqrt(counts.power(2) @ weights)
+        counts.data *= weights[counts.indices]
+        scores = (self.matrix @ counts.T).toarray().T
+        denominator = query_norms[:, None] * norms[None, :]
+        return np.divide(scores, denominator, out=np.zeros_like(scores), where=denominator > 0)
+
+    def score(self, query):
+        # A dense query vector: transposing a 1 x n_features sparse row would
+        # allocate an index array as wide as the whole feature space
+        weights, norms = self.query_weights()
+        counts = self.features.counts([query])
+        query_vector = np.zeros(self.features.n_features, dtype=np.float32)
+        query_vector[counts.indices] = counts.data * weights[counts.indices]
+        query_norm = np.sqrt(np.dot(counts.data ** 2, weights[counts.indices]))
+        scores = self.matrix @ query_vector
+        denominator = norms * query_norm
+        return np.divide(scores, denominator, out=np.zeros_like(scores), where=denominator > 0)
+
+    def candidates(self, query, limit, mask, min_score=0.0):
+        return exact_candidates(self.score(query), mask, min_score)
+
+    def keyword_mask(self, keywords, titles):
+        return title_keyword_mask(self.title_tokens, titles, keywords)
+
+    def nbytes(self):
+        matrix = sum(getattr(self.matrix, part).nbytes for part in ("data", "indices", "indptr"))
+        return matrix + self.features.df.nbytes
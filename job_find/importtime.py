@@ -0,0 +1,54 @@
+import re
+import subprocess
+import sys
+
+# `python -X importtime` lines: "import time: <self us> | <cumulative us> | <name>"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+DEFAULT_MODULES = ["job_find", "job_find.cli"]
+
+
+def run_importtime(statement, python=None):
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"{statement!r} failed:\n{proc.stderr.strip()}")
+    return [
+        (int(match.group(1)), int(match.group(2)), match.group(3))
+        for match in map(IMPORTTIME_LINE.match, proc.stderr.splitlines())
+        if match
+    ]
+
+
+def measure_import(module, python=None):
+    # Imports `module` in a fresh interpreter and returns the total import
+    # time plus the self time spent in each top-level package, in ms.
+    # Modules the bare interpreter loads at startup are left out.
+    startup = {name for _, _, name in run_importtime("pass", python)}
+    total_us = 0
+    packages = {}
+    for self_us, cumulative_us, name in run_importtime(f"import {module}", python):
+        if name in startup:
+            continue
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+        if name == module:
+            total_us = cumulative_us
+    return total_us / 1000, {package: us / 1000 for package, us in packages.items()}
+
+
+def check_import_budget(modules=None, budget_ms=150, top=10, out=sys.stdout):
+    # Prints what each entry point pulls in at import time and returns False
+    # if any of them goes over budget
+    within_budget = True
+    for module in modules or DEFAULT_MODULES:
+        total_ms, packages = measure_import(module)
+        status = "ok" if total_ms <= budget_ms else "OVER BUDGET"
+        within_budget = within_budget and total_ms <= budget_ms
+        print(f"{module}: {total_ms:.1f} ms (budget {budget_ms} ms) {status}", file=out)
+        for package, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            print(f"    {ms:8.1f} ms  {package}", file=out)
+    return within_budget
@@ -0,0 +1,207 @@
+import time
+
+import numpy as np
+
+from .config import MATCHER
+from .metrics import count, stage
+from .sources import normalize_jobs
+from .table import JobTable
+from .text import tokenize
+from .utils import LRUCache
+
+
+class JobIndex:
+    # TF-IDF index over one feed snapshot. Holds the fitted vocabulary, the IDF
+    # weights and the L2-normalized job matrix, so a search only has to
+    # transform the query and do one sparse mat-vec.
+    kind = "tfidf"
+    ann = None
+
+    def __init__(self, vectorizer, matrix, title_tokens, tokens_seen=0, tokens_unknown=0):
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.title_tokens = title_tokens
+        # Tokens of the postings appended since the vocabulary was fitted,
+        # and how many of those the vocabulary does not know
+        self.tokens_seen = tokens_seen
+        self.tokens_unknown = tokens_unknown
+
+    @classmethod
+    @stage("build_index")
+    def build(cls, job_texts, titles):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(stop_words="english")
+        matrix = vectorizer.fit_transform(job_texts)
+        return cls(vectorizer, matrix, build_token_index(titles))
+
+    @stage("extend_index")
+    def extend(self, job_texts, titles):
+        # Vectorize only the appended postings against the fitted vocabulary
+        from scipy import sparse
+
+        analyzer = self.vectorizer.build_analyzer()
+        vocabulary = self.vectorizer.vocabulary_
+        tokens_seen, tokens_unknown = self.tokens_seen, self.tokens_unknown
+        for text in job_texts:
+            tokens = analyzer(text)
+            tokens_seen += len(tokens)
+            tokens_unknown += sum(token not in vocabulary for token in tokens)
+
+        title_tokens = extend_token_index(self.title_tokens, titles, self.matrix.shape[0])
+        matrix = sparse.vstack([self.matrix, self.vectorizer.transform(job_texts)], format="csr")
+        return JobIndex(self.vectorizer, matrix, title_tokens, tokens_seen, tokens_unknown)
+
+    def drift(self):
+        # Share of appended tokens the fitted vocabulary cannot represent
+        return self.tokens_unknown / self.tokens_seen if self.tokens_seen else 0.0
+
+    def score(self, query):
+        query_vector = self.vectorizer.transform([query])
+        return (self.matrix @ query_vector.T).toarray().ravel()
+
+    def score_many(self, queries):
+        # One row of scores per query, from a single sparse product
+        return (self.vectorizer.transform(queries) @ self.matrix.T).toarray()
+
+    def candidates(self, query, limit, mask, min_score=0.0):
+        return exact_candidates(self.score(query), mask, min_score)
+
+    def keyword_mask(self, keywords, titles):
+        return title_keyword_mask(self.title_tokens, titles, keywords)
+
+    def nbytes(self):
+        return sum(getattr(self.matrix, part).nbytes for part in ("data", "indices", "indptr"))
+
+
+def index_class(kind):
+    # Matcher backends share this interface: build / extend / drift / score /
+    # score_many / candidates / keyword_mask, over rows aligned with the job
+    # table
+    if kind == "tfidf":
+        return JobIndex
+    if kind == "dense":
+        from .embedding import DenseIndex
+
+        return DenseIndex
+    if kind == "hashing":
+        from .hashing import HashingIndex
+
+        return HashingIndex
+    raise ValueError(f"unknown matcher {kind!r}")
+
+
+def exact_candidates(scores, mask, min_score):
+    # Rows allowed by `mask` that reach min_score, with their scores
+    rows = np.flatnonzero(mask & (np.round(scores, 2) >= min_score))
+    return rows, scores[rows]
+
+
+def title_keyword_mask(title_tokens, titles, keywords):
+    # Rows whose title contains every keyword as a substring, case-insensitive.
+    # Every word token of a keyword sits inside some token of a matching
+    # title, so the title vocabulary narrows the rows down. For a keyword
+    # that is one word token that is already exact; only keywords with
+    # spaces or punctuation have the remaining titles checked one by one.
+    mask = np.ones(len(titles), dtype=bool)
+    for keyword in keywords:
+        keyword = keyword.lower()
+        tokens = tokenize(keyword)
+        for token in tokens:
+            rows = [
+                postings for title_token, postings in title_tokens.items()
+                if token in title_token
+            ]
+            token_mask = np.zeros_like(mask)
+            if rows:
+                token_mask[np.concatenate(rows)] = True
+            mask &= token_mask
+        if tokens == [keyword]:
+            continue
+        for row in np.flatnonzero(mask):
+            if keyword not in titles[row].lower():
+                mask[row] = False
+    return mask
+
+
+def build_token_index(texts):
+    postings = {}
+    for row, text in enumerate(texts):
+        for token in set(tokenize(text)):
+            postings.setdefault(token, []).append(row)
+    return {token: np.array(rows, dtype=np.int32) for token, rows in postings.items()}
+
+
+def extend_token_index(title_tokens, titles, offset):
+    title_tokens = dict(title_tokens)
+    for token, rows in build_token_index(titles).items():
+        rows = rows + offset
+        title_tokens[token] = np.concatenate([title_tokens[token], rows]) if token in title_tokens else rows
+    return title_tokens
+
+
+_index_cache = LRUCache(2, name="index")
+
+
+def get_job_index(table, kind=None):
+    # Ad-hoc tables (not served through a FeedSnapshot) share built indexes
+    # by content fingerprint
+    kind = kind or MATCHER
+    index = _index_cache.get((table.fingerprint, kind))
+    if index is None:
+        index = index_class(kind).build(table.texts, table.titles)
+        _index_cache.put((table.fingerprint, kind), index)
+    return index
+
+
+class FeedSnapshot:
+    # A job table together with the index built over it
+    __slots__ = ("table", "index", "created_at")
+
+    def __init__(self, table, index, created_at):
+        self.table = table
+        self.index = index
+        self.created_at = created_at
+
+    @classmethod
+    def build(cls, table, kind=None):
+        index = index_class(kind or MATCHER).build(table.texts, table.titles) if len(table) else None
+        return cls(table, index, time.time())
+
+    def age(self):
+        return time.time() - self.created_at
+
+    def with_matcher(self, kind):
+        # The same jobs scored by another backend; the index is built once
+        # per table and matcher and then shared through the index cache
+        if self.index is None or self.index.kind == kind:
+            return self
+        return FeedSnapshot(self.table, get_job_index(self.table, kind), self.created_at)
+
+    def update(self, jobs, max_drift=0.1, max_dead=0.3, kind=None):
+        # Refresh cost follows churn rather than corpus size: only added
+        # postings are vectorized. The vocabulary is refitted from scratch
+        # once too many new tokens fall outside it or too many rows are dead,
+        # or when the snapshot is moving to another matcher.
+        kind = kind or (self.index.kind if self.index is not None else None)
+        if not jobs or self.index is None or self.index.kind != kind:
+            return FeedSnapshot.build(JobTable.from_jobs(jobs), kind)
+
+        table, added = self.table.apply_delta(jobs)
+        if len(added) == 0 and table is self.table:
+            return FeedSnapshot(self.table, self.index, time.time())
+
+        # A refresh that only removes postings just tombstones rows; the
+        # index stays as it is
+        index = self.index.extend(table.texts[added], table.titles[added]) if len(added) else self.index
+        if index.drift() > max_drift or table.dead_fraction() > max_dead:
+            count("index_rebuild")
+            return FeedSnapshot.build(table.compact(), kind)
+        return FeedSnapshot(table, index, time.time())
+
+
+def as_snapshot(jobs):
+    if isinstance(jobs, FeedSnapshot):
+        return jobs
+    table = jobs if isinstance(jobs, JobTable) else JobTable.from_jobs(normalize_jobs(jobs))
+    return FeedSnapshot(table, get_job_index(table) if len(table) else None, time.time())
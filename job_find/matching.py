@@ -0,0 +1,112 @@
+import numpy as np
+
+from .index import as_snapshot
+from .metrics import stage
+from .salary import estimate_salaries
+
+
+def top_k(scores, k):
+    # Indices of the k highest scores, best first, without sorting everything
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+@stage("match")
+def match_rows(skills, jobs, limit=30, min_score=0.0, keywords=None):
+    # Row indices of the best matching jobs, best first, with their scores
+    snapshot = as_snapshot(jobs)
+    if len(snapshot.table) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+
+    index = snapshot.index
+
+    # Filter before top-k so a full page of qualifying jobs comes back
+    mask = np.array(snapshot.table.alive, dtype=bool)
+    if keywords:
+        mask &= index.keyword_mask(keywords, snapshot.table.titles)
+    rows, scores = index.candidates(" ".join(skills), limit, mask, min_score)
+
+    best = top_k(scores, limit)
+    return rows[best], scores[best]
+
+
+def semantic_match_jobs(skills, jobs, limit=30, min_score=0.0, keywords=None):
+    snapshot = as_snapshot(jobs)
+    table = snapshot.table
+    rows, scores = match_rows(skills, snapshot, limit, min_score, keywords)
+
+    # Only the jobs that make the cut get a salary estimate
+    salaries = estimate_salaries(table.titles[rows])
+
+    results = []
+    for row, score, salary in zip(rows, scores, salaries):
+        job = table.row(row)
+        job["score"] = round(float(score), 2)
+        job["salary"] = salary
+        results.append(job)
+
+    return results
+
+
+def top_k_rows(scores, k):
+    # Row-wise top_k over a 2-D score matrix, best first in every row
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+@stage("batch_match")
+def batch_match_jobs(profiles, jobs, limit=30, min_score=0.0, chunk_cells=10_000_000):
+    # Ranks jobs for many candidates at once: every candidate's skills are
+    # encoded by the snapshot's matcher and the whole N x M similarity comes
+    # out of one matrix product. Candidates are taken
+    # in chunks only to keep the dense score block under `chunk_cells`.
+    # `profiles` are parse_resume results or plain skill lists.
+    snapshot = as_snapshot(jobs)
+    table, index = snapshot.table, snapshot.index
+    if len(table) == 0:
+        return [[] for _ in profiles]
+
+    queries = [
+        " ".join(profile["skills"] if isinstance(profile, dict) else profile)
+        for profile in profiles
+    ]
+    excluded = ~table.alive
+
+    rows_per_candidate, scores_per_candidate = [], []
+    chunk = max(chunk_cells // len(table), 1)
+    for start in range(0, len(queries), chunk):
+        scores = index.score_many(queries[start:start + chunk])
+        scores[:, excluded] = -np.inf
+        scores[np.round(scores, 2) < min_score] = -np.inf
+
+        best = top_k_rows(scores, limit)
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        for rows, row_scores in zip(best, best_scores):
+            keep = np.isfinite(row_scores)
+            rows_per_candidate.append(rows[keep])
+            scores_per_candidate.append(row_scores[keep])
+
+    # One salary estimate per distinct shortlisted job
+    shortlisted = np.unique(np.concatenate(rows_per_candidate)) if rows_per_candidate else []
+    salaries = dict(zip(shortlisted, estimate_salaries(table.titles[shortlisted])))
+
+    results = []
+    for rows, row_scores in zip(rows_per_candidate, scores_per_candidate):
+        matches = []
+        for row, score in zip(rows, row_scores):
+            job = table.row(row)
+            job["score"] = round(float(score), 2)
+            job["salary"] = salaries[row]
+            matches.append(job)
+        results.append(matches)
+    return results
@@ -0,0 +1,160 @@
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# Hot-path instrumentation. `stage(name)` times a block (or decorates a
+# function) and records wall time, CPU time of the calling thread and, while
+# allocation tracking is on, the peak of traced memory above the level at
+# entry. Every stage is added to process-wide totals (see `render_prometheus`),
+# to the current request's Recorder if one was begun, and logged as a JSON
+# line on the "job_find.metrics" logger at INFO.
+#
+# Allocation tracking is opt-in per request (`track_allocations`). tracemalloc
+# itself is process-wide, though: while any request has it on, every thread is
+# traced and slowed down, and concurrent requests show up in each other's
+# peaks, so those are only exact while one request runs at a time.
+
+
+class Recorder:
+    # The stages and counters of one request (a Streamlit rerun, a CLI call)
+    def __init__(self):
+        self.events = []
+        self.counters = {}
+
+
+class Registry:
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def add_stage(self, event):
+        with self.lock:
+            totals = self.stages.setdefault(
+                event["stage"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "alloc_peak_bytes": 0}
+            )
+            totals["calls"] += 1
+            totals["wall_s"] += event["wall_ms"] / 1000
+            totals["cpu_s"] += event["cpu_ms"] / 1000
+            if event.get("alloc_peak_bytes") is not None:
+                totals["alloc_peak_bytes"] = max(totals["alloc_peak_bytes"], event["alloc_peak_bytes"])
+
+    def add_count(self, name, n):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+
+registry = Registry()
+_recorder = contextvars.ContextVar("job_find_recorder", default=None)
+# Peak traced memory seen by enclosing stages, so a nested stage resetting the
+# tracemalloc peak does not hide it from its parent
+_alloc_frames = contextvars.ContextVar("job_find_alloc_frames", default=())
+
+
+def begin_request():
+    recorder = Recorder()
+    _recorder.set(recorder)
+    return recorder
+
+
+_tracking_lock = threading.Lock()
+# Requests tracking allocations right now, and whether tracemalloc was started
+# for them (rather than by someone else, e.g. the benchmark)
+_tracking = {"requests": 0, "started": False}
+
+
+@contextlib.contextmanager
+def track_allocations():
+    # Traces allocations for the duration of the block. Overlapping blocks
+    # share one tracemalloc session, stopped when the last of them ends.
+    with _tracking_lock:
+        if _tracking["requests"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracking["started"] = True
+        _tracking["requests"] += 1
+    try:
+        yield
+    finally:
+        with _tracking_lock:
+            _tracking["requests"] -= 1
+            if _tracking["requests"] == 0 and _tracking["started"]:
+                tracemalloc.stop()
+                _tracking["started"] = False
+
+
+def count(name, n=1):
+    registry.add_count(name, n)
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.counters[name] = recorder.counters.get(name, 0) + n
+
+
+@contextlib.contextmanager
+def stage(name):
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        start_mem, outer_peak = tracemalloc.get_traced_memory()
+        frame = [outer_peak]
+        frames = _alloc_frames.get()
+        token = _alloc_frames.set(frames + (frame,))
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    try:
+        yield
+    finally:
+        event = {
+            "stage": name,
+            "wall_ms": (time.perf_counter() - started) * 1000,
+            "cpu_ms": (time.thread_time() - cpu_started) * 1000,
+            "alloc_peak_bytes": None,
+        }
+        if tracing:
+            _alloc_frames.reset(token)
+            # Another request may have stopped tracing in the meantime
+            if tracemalloc.is_tracing():
+                peak = max([tracemalloc.get_traced_memory()[1]] + frame[1:])
+                event["alloc_peak_bytes"] = max(peak - start_mem, 0)
+                if frames:
+                    frames[-1].append(max(peak, frame[0]))
+        record(event)
+
+
+def record(event):
+    registry.add_stage(event)
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.events.append(event)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(event))
+
+
+def render_prometheus():
+    # Text exposition format, for scraping or for pasting into a bug report
+    with registry.lock:
+        stages = {name: dict(totals) for name, totals in registry.stages.items()}
+        counters = dict(registry.counters)
+
+    lines = []
+    metrics = [
+        ("calls", "job_find_stage_calls_total", "counter", "Times each stage ran."),
+        ("wall_s", "job_find_stage_wall_seconds_total", "counter", "Wall time spent in each stage."),
+        ("cpu_s", "job_find_stage_cpu_seconds_total", "counter", "CPU time of the calling thread in each stage."),
+        ("alloc_peak_bytes", "job_find_stage_alloc_peak_bytes", "gauge",
+         "Largest traced allocation peak of each stage (0 unless allocation tracking is on)."),
+    ]
+    for key, metric, kind, help_text in metrics:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name in sorted(stages):
+            lines.append(f'{metric}{{stage="{name}"}} {stages[name][key]:g}')
+    for name in sorted(counters):
+        lines.append(f"# TYPE job_find_{name}_total counter")
+        lines.append(f"job_find_{name}_total {counters[name]}")
+    return "\n".join(lines) + "\n"
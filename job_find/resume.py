@@ -0,0 +1,291 @@
+import hashlib
+import io
+import itertools
+import multiprocessing
+import os
+import re
+import signal
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .metrics import stage
+from .utils import once
+
+
+COMMON_SKILLS = [
+    "python", "java", "javascript", "react", "django", "fastapi",
+    "machine learning", "data science", "sql", "mongodb", "node"
+]
+
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\s+years?')
+
+
+class SkillMatcher:
+    # Compiles the whole skill taxonomy into one regex shaped like a prefix
+    # trie, so the text is scanned once no matter how many skills there are.
+    # Matches must sit on word boundaries ("java" does not fire inside
+    # "javascript") and multi-word skills tolerate any run of whitespace.
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(" ".join(s.lower().split()) for s in skills))
+        trie = {}
+        for skill in self.skills:
+            node = trie
+            for char in skill:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self.pattern = re.compile(r"(?<!\w)(?:" + _trie_regex(trie) + r")(?!\w)")
+
+    def matches(self, text):
+        # Skill -> start offsets, in order of first appearance
+        found = {}
+        for match in self.pattern.finditer(text.lower()):
+            skill = " ".join(match.group().split())
+            found.setdefault(skill, []).append(match.start())
+        return found
+
+    def counts(self, text):
+        return {skill: len(offsets) for skill, offsets in self.matches(text).items()}
+
+    def find(self, text):
+        return list(self.matches(text))
+
+    def contains_any(self, text):
+        return self.pattern.search(text.lower()) is not None
+
+
+def _trie_regex(node):
+    branches = []
+    optional = False
+    for char, child in sorted(node.items()):
+        if char == "":
+            optional = True
+            continue
+        atom = r"\s+" if char == " " else re.escape(char)
+        branches.append(atom + _trie_regex(child) if child else atom)
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 and not optional else "(?:" + "|".join(branches) + ")"
+    return body + "?" if optional else body
+
+
+@once
+def get_skill_matcher():
+    return SkillMatcher(COMMON_SKILLS)
+
+
+def find_skills(text):
+    return get_skill_matcher().find(text)
+
+
+def extract_resume_text(file, max_pages=None, stop_early=False):
+    # Each page goes through pdfplumber's layout analysis exactly once.
+    # With stop_early, reading ends at the first page by which both a
+    # skill and an experience figure have been seen.
+    import pdfplumber
+
+    chunks = []
+    has_skills = has_experience = False
+    with pdfplumber.open(file) as pdf:
+        pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+        for page in pages:
+            page_text = page.extract_text()
+            if not page_text:
+                continue
+            page_text = page_text.lower()
+            chunks.append(page_text)
+
+            if stop_early:
+                has_skills = has_skills or get_skill_matcher().contains_any(page_text)
+                has_experience = has_experience or bool(EXPERIENCE_PATTERN.search(page_text))
+                if has_skills and has_experience:
+                    break
+
+    return "\n".join(chunks)
+
+
+@stage("parse_resume")
+def parse_resume(file, max_pages=None, stop_early=False):
+    text = extract_resume_text(file, max_pages=max_pages, stop_early=stop_early)
+
+    skills = find_skills(text)
+    exp = EXPERIENCE_PATTERN.findall(text)
+
+    return {
+        "skills": skills or ["developer"],
+        "experience": exp[0] if exp else "Not specified",
+        "location": "Anywhere"
+    }
+
+
+def parse_resume_cached(data, cache):
+    # The same file is only parsed once per cache, keyed by a hash of its bytes
+    key = hashlib.sha256(data).hexdigest()
+    parsed = cache.get(key)
+    if parsed is None:
+        parsed = parse_resume(io.BytesIO(data))
+        cache.put(key, parsed)
+    return parsed
+
+
+class ResumeTimeout(Exception):
+    pass
+
+
+def _raise_resume_timeout(signum, frame):
+    raise ResumeTimeout()
+
+
+def _parse_resume_file(name, source, timeout):
+    # Runs in a pool worker. SIGALRM bounds the time spent on one file, so a
+    # malformed PDF fails on its own instead of occupying the worker.
+    started = time.perf_counter()
+    use_alarm = timeout and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_resume_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        return {"file": name, "profile": parse_resume(source), "error": None,
+                "seconds": time.perf_counter() - started}
+    except ResumeTimeout:
+        error = f"timed out after {timeout}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return {"file": name, "profile": None, "error": error,
+            "seconds": time.perf_counter() - started}
+
+
+# Set in pool workers: where each worker reports the files it picks up, so the
+# parent can time them from the moment they actually start
+_started_queue = None
+
+
+def _init_worker(started_queue):
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _run_resume_task(task, name, source, timeout):
+    if _started_queue is not None:
+        _started_queue.put((task, os.getpid(), time.monotonic()))
+    return _parse_resume_file(name, source, timeout)
+
+
+def _kill_worker(pid):
+    # For a worker stuck in C code, which neither the alarm nor
+    # shutdown() can interrupt
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+
+def iter_resume_files(path):
+    # (name, source) pairs from a single PDF, a directory of PDFs or a .zip
+    # archive of them; files are passed by path, archive members by their bytes
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if member.lower().endswith(".pdf"):
+                    yield member, archive.read(member)
+        return
+    if os.path.isfile(path) and path.lower().endswith(".pdf"):
+        yield path, path
+        return
+    if not os.path.isdir(path):
+        raise ValueError(f"{path} is not a PDF, a .zip archive or a directory")
+    for root, _, files in os.walk(path):
+        for filename in sorted(files):
+            if filename.lower().endswith(".pdf"):
+                filename = os.path.join(root, filename)
+                yield filename, filename
+
+
+def ingest_resumes(path, workers=None, timeout=30):
+    # Parses every PDF under `path` on a process pool across all cores and
+    # yields each result as soon as it is ready: a dict with the file name,
+    # the parsed profile (or None) and the error, if any. A worker still on
+    # one file twice the timeout after picking it up is killed; that breaks
+    # the pool, so a fresh one takes over the files that were still queued.
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context()
+    started_queue = context.SimpleQueue()
+    files = iter_resume_files(path)
+    tasks = itertools.count()
+    pending = {}  # future -> (task, name, source)
+    running = {}  # task -> (worker pid, monotonic start)
+    pool = None
+
+    def new_pool():
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                   initializer=_init_worker, initargs=(started_queue,))
+
+    def submit(name, source):
+        task = next(tasks)
+        pending[pool.submit(_run_resume_task, task, name, source, timeout)] = (task, name, source)
+
+    def drain_started():
+        while not started_queue.empty():
+            task, pid, started = started_queue.get()
+            running[task] = (pid, started)
+
+    try:
+        pool = new_pool()
+        while True:
+            # Keep a bounded number of files in flight so huge archives are
+            # streamed rather than loaded into the queue up front
+            for name, source in itertools.islice(files, 2 * workers - len(pending)):
+                submit(name, source)
+            if not pending:
+                break
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.pop(pending.pop(future)[0], None)
+                yield future.result()
+            if not timeout:
+                continue
+
+            # Backstop for files the in-worker alarm could not interrupt
+            drain_started()
+            now = time.monotonic()
+            stuck = [
+                future for future, (task, _, _) in pending.items()
+                if task in running and now - running[task][1] > 2 * timeout
+            ]
+            if not stuck:
+                continue
+            for future in stuck:
+                task, name, _ = pending.pop(future)
+                pid, started = running.pop(task)
+                _kill_worker(pid)
+                yield {"file": name, "profile": None,
+                       "error": f"timed out after {timeout}s", "seconds": now - started}
+
+            pool.shutdown(wait=True, cancel_futures=True)
+            requeue = []
+            for future, (task, name, source) in pending.items():
+                running.pop(task, None)
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    yield future.result()
+                else:
+                    requeue.append((name, source))
+            pending.clear()
+            pool = new_pool()
+            for name, source in requeue:
+                submit(name, source)
+    finally:
+        if pool is not None:
+            # An abandoned run does not wait on the files still in flight
+            if pending:
+                drain_started()
+                for task, _, _ in pending.values():
+                    if task in running:
+                        _kill_worker(running[task][0])
+            pool.shutdown(wait=True, cancel_futures=True)
+        started_queue.close()
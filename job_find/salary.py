@@ -0,0 +1,70 @@
+import numpy as np
+
+from .config import MATCHER
+from .metrics import stage
+from .utils import once
+
+
+SALARY_DATA = {
+    "junior software engineer": 60000,
+    "software engineer": 80000,
+    "senior software engineer": 110000,
+    "backend developer": 90000,
+    "full stack developer": 95000,
+    "machine learning engineer": 120000,
+    "data scientist": 115000,
+    "devops engineer": 105000,
+    "frontend developer": 85000,
+    "cloud architect": 130000
+}
+
+
+class SalaryEstimator:
+    # Fits the SALARY_DATA title vectors once; any number of job titles are
+    # then scored against them with a single sparse matrix product. With
+    # hashed features nothing is fitted beyond the document frequencies.
+    def __init__(self, salary_data, features="tfidf"):
+        self.titles = list(salary_data.keys())
+        self.salaries = np.array(list(salary_data.values()))
+        if features == "hashing":
+            from .hashing import HashingFeatures
+
+            self.vectorizer = HashingFeatures()
+        else:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            self.vectorizer = TfidfVectorizer(stop_words="english")
+        # Kept transposed as CSR, so the product does not convert a matrix as
+        # wide as the feature space on every call
+        self.title_vectors = self.vectorizer.fit_transform(self.titles).T.tocsr()
+
+    def estimate(self, job_titles):
+        vectors = self.vectorizer.transform(job_titles)
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        similarities = (vectors @ self.title_vectors).toarray()
+        return self.salaries[similarities.argmax(axis=1)]
+
+    def estimate_ranges(self, job_titles):
+        if len(job_titles) == 0:
+            return []
+        estimated = self.estimate(job_titles)
+
+        # Convert to range
+        lows = (estimated * 0.85).astype(np.int64) // 1000
+        highs = (estimated * 1.15).astype(np.int64) // 1000
+
+        return [f"${low}k – ${high}k" for low, high in zip(lows, highs)]
+
+
+@once
+def get_salary_estimator():
+    return SalaryEstimator(SALARY_DATA, features="hashing" if MATCHER == "hashing" else "tfidf")
+
+
+def ai_estimate_salary(job_title):
+    return estimate_salaries([job_title])[0]
+
+
+@stage("salary")
+def estimate_salaries(titles):
+    return get_salary_estimator().estimate_ranges(titles)
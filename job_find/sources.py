@@ -0,0 +1,168 @@
+import contextvars
+import logging
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from .config import REMOTIVE_URL
+from .metrics import count, stage
+from .text import clean_text, html_to_text
+from .utils import once
+
+logger = logging.getLogger(__name__)
+
+
+def make_http_session(pool_size=8):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return session
+
+
+class JobSource(ABC):
+    # One upstream job board. Adapters map their payload onto the normalized
+    # job schema: id, title, company, location, url, description, source.
+    #
+    # Requests go through a keep-alive session and are revalidated with the
+    # stored ETag / Last-Modified, so an unchanged feed costs a 304 and hands
+    # back the very same job list (and with it, the cached indexes).
+    name = "source"
+
+    def __init__(self, url, deadline=10, session=None):
+        self.url = url
+        self.deadline = deadline
+        self.session = session
+        self.etag = None
+        self.last_modified = None
+        self.jobs = []
+
+    def fetch(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        if self.session is None:
+            self.session = make_http_session()
+
+        with self.session.get(self.url, headers=headers, timeout=self.deadline, stream=True) as res:
+            if res.status_code == 304:
+                count(f"{self.name}_not_modified")
+                return self.jobs
+            res.raise_for_status()
+
+            # parse() reads the body incrementally from the raw stream
+            res.raw.decode_content = True
+            self.jobs = self.parse(res)
+            count(f"{self.name}_downloaded")
+            self.etag = res.headers.get("ETag")
+            self.last_modified = res.headers.get("Last-Modified")
+        return self.jobs
+
+    @abstractmethod
+    def parse(self, res):
+        # The normalized jobs of a streamed 200 response
+        ...
+
+    @abstractmethod
+    def normalize(self, job):
+        # One upstream posting as a job in the normalized schema
+        ...
+
+
+class RemotiveSource(JobSource):
+    name = "remotive"
+
+    def __init__(self, url=REMOTIVE_URL, deadline=10, session=None):
+        super().__init__(url, deadline, session)
+
+    def parse(self, res):
+        # Jobs are decoded one at a time, so only the current posting and the
+        # trimmed-down results are ever held in memory, never the whole body
+        import ijson
+
+        return [self.normalize(job) for job in ijson.items(res.raw, "jobs.item")]
+
+    def normalize(self, job):
+        return {
+            "id": f"{self.name}:{job.get('id', job.get('url'))}",
+            "title": job.get("title") or "",
+            "company": job.get("company_name") or "",
+            "location": job.get("candidate_required_location") or "",
+            "url": job.get("url") or "",
+            "description": html_to_text(job.get("description") or ""),
+            "source": self.name,
+        }
+
+
+@once
+def get_http_session():
+    return make_http_session()
+
+
+@once
+def get_job_sources():
+    return [RemotiveSource(session=get_http_session())]
+
+
+@once
+def get_fetch_pool():
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="job-source")
+
+
+def fetch_all_sources(sources, pool):
+    # Every source is fetched concurrently. Each one gets its own deadline;
+    # a source that misses it is skipped instead of holding up the merge.
+    started = time.monotonic()
+    futures = [pool.submit(contextvars.copy_context().run, source.fetch) for source in sources]
+
+    jobs = []
+    seen_urls = set()
+    for source, future in zip(sources, futures):
+        remaining = source.deadline - (time.monotonic() - started)
+        try:
+            source_jobs = future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning("job source %s missed its %ss deadline", source.name, source.deadline)
+            continue
+        except Exception:
+            logger.warning("job source %s failed", source.name, exc_info=True)
+            continue
+
+        for job in source_jobs:
+            if job["url"] in seen_urls:
+                continue
+            seen_urls.add(job["url"])
+            jobs.append(job)
+
+    return jobs
+
+
+def normalize_jobs(jobs):
+    # Raw Remotive postings (company_name, candidate_required_location, HTML
+    # description), as the API returns them, are mapped onto the normalized
+    # schema; jobs already in it pass through
+    remotive = RemotiveSource(url=None)
+    return [remotive.normalize(job) if "company_name" in job and "company" not in job else job for job in jobs]
+
+
+def prepare_jobs(jobs):
+    # Runs once per feed snapshot: each job carries a compact "text" column
+    # of its clean title and description, and the raw description is dropped
+    prepared = []
+    for job in jobs:
+        job = dict(job)
+        job["text"] = clean_text(job["title"] + " " + job.pop("description", ""))
+        prepared.append(job)
+    return prepared
+
+
+@stage("fetch")
+def fetch_jobs():
+    return prepare_jobs(fetch_all_sources(get_job_sources(), get_fetch_pool()))
@@ -0,0 +1,374 @@
+import json
+import logging
+import os
+import shutil
+import threading
+
+import numpy as np
+
+from .ann import IVFIndex
+from .config import FEED_TTL, MATCHER, SNAPSHOT_DIR
+from .index import FeedSnapshot, JobIndex, index_class
+from .sources import fetch_jobs
+from .table import JobTable, StringColumn
+from .utils import once
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    # Feed snapshots on disk, one directory per snapshot plus a LATEST pointer
+    # that is swapped atomically. Arrays are stored as .npy files and opened
+    # memory-mapped, so a new process can serve searches straight away.
+    version = 6
+
+    def __init__(self, directory, keep=2):
+        self.directory = directory
+        self.keep = keep
+
+    def save(self, snapshot):
+        # Named by millisecond and matcher, so saving the same rows twice in
+        # quick succession (e.g. under two matchers) does not collide
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{int(snapshot.created_at * 1000)}-{snapshot.table.fingerprint[:12]}-{snapshot.index.kind}"
+        path = os.path.join(self.directory, name)
+        tmp = os.path.join(self.directory, f".{name}.{os.getpid()}.tmp")
+        os.makedirs(tmp)
+        try:
+            self.write(tmp, snapshot)
+            os.replace(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        write_atomic(os.path.join(self.directory, "LATEST"), name)
+        self.prune(keep=name)
+
+    def write(self, tmp, snapshot):
+        table, index = snapshot.table, snapshot.index
+        for column in ("ids", "titles", "urls", "texts"):
+            save_strings(tmp, column, getattr(table, column))
+        for column in ("company_codes", "location_codes", "source_codes", "alive"):
+            np.save(os.path.join(tmp, f"{column}.npy"), getattr(table, column))
+
+        if index.kind == "tfidf":
+            save_strings(tmp, "terms", index.vectorizer.get_feature_names_out())
+            np.save(os.path.join(tmp, "idf.npy"), index.vectorizer.idf_)
+            for part in ("data", "indices", "indptr"):
+                np.save(os.path.join(tmp, f"matrix_{part}.npy"), getattr(index.matrix, part))
+        elif index.kind == "hashing":
+            # Raw counts plus document frequencies; there is no vocabulary
+            np.save(os.path.join(tmp, "df.npy"), index.features.df)
+            for part in ("data", "indices", "indptr"):
+                np.save(os.path.join(tmp, f"matrix_{part}.npy"), getattr(index.matrix, part))
+        else:
+            # Half precision halves the file; it is widened once on load
+            save_strings(tmp, "terms", index.terms)
+            np.save(os.path.join(tmp, "idf.npy"), index.idf)
+            np.save(os.path.join(tmp, "embeddings.npy"), index.matrix.astype(np.float16))
+            if index.ann is not None:
+                np.save(os.path.join(tmp, "ann_centroids.npy"), index.ann.centroids)
+                np.save(os.path.join(tmp, "ann_assign.npy"), index.ann.assign)
+
+        tokens = list(index.title_tokens)
+        postings = [index.title_tokens[token] for token in tokens]
+        save_strings(tmp, "title_tokens", tokens)
+        np.save(os.path.join(tmp, "title_postings.npy"), np.concatenate(postings))
+        np.save(os.path.join(tmp, "title_offsets.npy"), string_offsets(len(p) for p in postings))
+
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({
+                "version": self.version,
+                "fingerprint": table.fingerprint,
+                "matcher": index.kind,
+                "created_at": snapshot.created_at,
+                "shape": list(index.matrix.shape),
+                "tokens_seen": index.tokens_seen,
+                "tokens_unknown": index.tokens_unknown,
+                "n_docs": index.features.n_docs if index.kind == "hashing" else None,
+                "ann": index.ann is not None,
+                "companies": table.companies,
+                "locations": table.locations,
+                "sources": table.sources,
+            }, f)
+
+    def touch(self, snapshot):
+        # Moves the timestamp of the latest snapshot on disk forward without
+        # rewriting its arrays, if it holds the same rows and matcher as
+        # `snapshot`. Returns whether it did.
+        try:
+            path = self.latest_path()
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (
+            meta.get("version") != self.version
+            or meta.get("fingerprint") != snapshot.table.fingerprint
+            or meta.get("matcher") != snapshot.index.kind
+            or meta.get("shape", [None])[0] != len(snapshot.table)
+        ):
+            return False
+        meta["created_at"] = snapshot.created_at
+        write_atomic(os.path.join(path, "meta.json"), json.dumps(meta))
+        return True
+
+    def latest_path(self):
+        with open(os.path.join(self.directory, "LATEST")) as f:
+            return os.path.join(self.directory, f.read().strip())
+
+    def load_latest(self):
+        try:
+            path = self.latest_path()
+        except FileNotFoundError:
+            return None
+
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            if meta["version"] != self.version:
+                return None
+
+            table = JobTable(
+                ids=load_strings(path, "ids"),
+                titles=load_strings(path, "titles"),
+                urls=load_strings(path, "urls"),
+                texts=load_strings(path, "texts"),
+                company_codes=load_array(path, "company_codes"),
+                companies=meta["companies"],
+                location_codes=load_array(path, "location_codes"),
+                locations=meta["locations"],
+                source_codes=load_array(path, "source_codes"),
+                sources=meta["sources"],
+                alive=load_array(path, "alive"),
+                fingerprint=meta["fingerprint"],
+            )
+
+            postings = load_array(path, "title_postings")
+            offsets = load_array(path, "title_offsets")
+            title_tokens = {
+                token: postings[offsets[i]:offsets[i + 1]]
+                for i, token in enumerate(load_strings(path, "title_tokens"))
+            }
+            index = load_index(path, meta, title_tokens)
+        except (OSError, ValueError, KeyError):
+            logger.warning("could not load feed snapshot from %s", self.directory, exc_info=True)
+            return None
+
+        return FeedSnapshot(table, index, meta["created_at"])
+
+    def prune(self, keep):
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name != "LATEST" and not name.startswith(".") and name != keep
+        )
+        for name in names[:max(len(names) - self.keep + 1, 0)]:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+def load_index(path, meta, title_tokens):
+    if meta["matcher"] == "hashing":
+        from scipy import sparse
+
+        from .hashing import HashingFeatures, HashingIndex
+
+        df = load_array(path, "df")
+        matrix = sparse.csr_matrix(
+            tuple(load_array(path, f"matrix_{part}") for part in ("data", "indices", "indptr")),
+            shape=tuple(meta["shape"]),
+            copy=False,
+        )
+        return HashingIndex(HashingFeatures(len(df), df, meta["n_docs"]), matrix, title_tokens)
+
+    terms = list(load_strings(path, "terms"))
+    idf = np.load(os.path.join(path, "idf.npy"))
+    if meta["matcher"] == "tfidf":
+        from scipy import sparse
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(stop_words="english", vocabulary=terms)
+        vectorizer.idf_ = idf
+        matrix = sparse.csr_matrix(
+            tuple(load_array(path, f"matrix_{part}") for part in ("data", "indices", "indptr")),
+            shape=tuple(meta["shape"]),
+            copy=False,
+        )
+        return JobIndex(vectorizer, matrix, title_tokens, meta["tokens_seen"], meta["tokens_unknown"])
+
+    ann = None
+    if meta["ann"]:
+        ann = IVFIndex(load_array(path, "ann_centroids"), load_array(path, "ann_assign"))
+    index_type = index_class(meta["matcher"])
+    return index_type(terms, idf, load_array(path, "embeddings"), title_tokens,
+                      meta["tokens_seen"], meta["tokens_unknown"], ann)
+
+
+def string_offsets(lengths):
+    lengths = np.fromiter(lengths, dtype=np.int64)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def save_strings(path, name, values):
+    encoded = [value.encode("utf-8") for value in values]
+    np.save(os.path.join(path, f"{name}_blob.npy"), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    np.save(os.path.join(path, f"{name}_offsets.npy"), string_offsets(len(e) for e in encoded))
+
+
+def load_strings(path, name):
+    return StringColumn(load_array(path, f"{name}_blob"), load_array(path, f"{name}_offsets"))
+
+
+def load_array(path, name):
+    filename = os.path.join(path, f"{name}.npy")
+    try:
+        return np.load(filename, mmap_mode="r")
+    except ValueError:
+        # Zero-length arrays cannot be memory-mapped
+        return np.load(filename)
+
+
+def write_atomic(filename, content):
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(content)
+    os.replace(tmp, filename)
+
+
+@once
+def get_snapshot_store():
+    return SnapshotStore(SNAPSHOT_DIR)
+
+
+def load_snapshot(store=None, max_age=FEED_TTL, matcher=None):
+    # One-shot access for scripts and the CLI: the latest snapshot on disk,
+    # refreshed first if it is missing or older than max_age
+    store = store or get_snapshot_store()
+    matcher = matcher or MATCHER
+    snapshot = store.load_latest()
+    if snapshot is None or snapshot.age() >= max_age:
+        fresh = refresh_snapshot(store, snapshot, matcher)
+        if snapshot is None or len(fresh.table):
+            return fresh
+    return snapshot.with_matcher(matcher)
+
+
+def refresh_snapshot(store, previous=None, matcher=None):
+    jobs = fetch_jobs()
+    if previous is None:
+        snapshot = FeedSnapshot.build(JobTable.from_jobs(jobs), matcher or MATCHER)
+    else:
+        snapshot = previous.update(jobs, kind=matcher or MATCHER)
+    unchanged = previous is not None and snapshot.table is previous.table and snapshot.index is previous.index
+    if len(snapshot.table):
+        try:
+            # An unchanged feed (often a 304) only needs its timestamp moved
+            if not (unchanged and store.touch(snapshot)):
+                store.save(snapshot)
+        except OSError:
+            logger.warning("could not save feed snapshot to %s", store.directory, exc_info=True)
+    return snapshot
+
+
+class FeedRefresher:
+    # Stale-while-revalidate for the feed. A daemon thread rebuilds the
+    # snapshot ahead of expiry (after `lead` of the TTL is left) and swaps it
+    # in with a single reference assignment; until then searches keep using
+    # the previous snapshot, so no request waits on upstream latency. Only a
+    # process with no snapshot in memory or on disk fetches synchronously.
+    #
+    # The snapshot on disk is indexed for MATCHER. Other matchers are indexed
+    # the first time a search asks for one, and from then on the refresh
+    # thread updates their snapshots along with the main one.
+    def __init__(self, store, ttl=FEED_TTL, lead=0.2, retry_after=60):
+        self.store = store
+        self.refresh_after = ttl * (1 - lead)
+        self.retry_after = retry_after
+        self.snapshot = None
+        self.others = {}
+        self._lock = threading.Lock()
+        self._others_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def current(self, matcher=None):
+        if self.snapshot is None:
+            with self._lock:
+                if self.snapshot is None:
+                    snapshot = self.store.load_latest() or refresh_snapshot(self.store)
+                    self.snapshot = snapshot.with_matcher(MATCHER)
+        self.start()
+        snapshot = self.snapshot
+        if matcher is None or snapshot.index is None or snapshot.index.kind == matcher:
+            return snapshot
+        other = self.others.get(matcher)
+        if other is None:
+            with self._others_lock:
+                other = self.others.get(matcher)
+                if other is None:
+                    other = snapshot.with_matcher(matcher)
+                    self.others = {**self.others, matcher: other}
+        return other
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self.run, name="feed-refresh", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        while not self._stop.wait(self.seconds_until_refresh()):
+            if not self.refresh() and self._stop.wait(self.retry_after):
+                break
+
+    def seconds_until_refresh(self):
+        snapshot = self.snapshot
+        if snapshot is None or len(snapshot.table) == 0:
+            return 0
+        return max(self.refresh_after - snapshot.age(), 0)
+
+    def refresh(self):
+        # Another process sharing the store may already have done the work
+        latest = self.store.load_latest()
+        current = self.snapshot
+        if (
+            latest is not None
+            and latest.age() < self.refresh_after
+            and (current is None or latest.created_at > current.created_at)
+        ):
+            snapshot = latest.with_matcher(MATCHER)
+        else:
+            try:
+                snapshot = refresh_snapshot(self.store, current)
+            except Exception:
+                logger.warning("feed refresh failed", exc_info=True)
+                return False
+            if len(snapshot.table) == 0:
+                return False
+        self.update_others(current, snapshot)
+        self.snapshot = snapshot
+        return True
+
+    def update_others(self, current, snapshot):
+        # Brings the other matchers' snapshots to the rows of `snapshot`
+        # before it is swapped in, so a search never has to index them
+        if current is not None and snapshot.table is current.table:
+            return
+        with self._others_lock:
+            if not self.others:
+                return
+            try:
+                jobs = list(snapshot.table.live_jobs())
+                self.others = {kind: other.update(jobs, kind=kind) for kind, other in self.others.items()}
+            except Exception:
+                logger.warning("could not update the other matchers' snapshots", exc_info=True)
+                self.others = {}
+
+
+@once
+def get_feed_refresher():
+    return FeedRefresher(get_snapshot_store())
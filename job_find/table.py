@@ -0,0 +1,198 @@
+import hashlib
+import sys
+
+import numpy as np
+
+from .text import clean_text
+
+
+class JobTable:
+    # Columnar store for one feed snapshot. Jobs are addressed by row index;
+    # strings live in object arrays and the low-cardinality columns (company,
+    # location, source) are interned once and stored as int32 codes, which
+    # keeps merged feeds small and makes filters plain array comparisons.
+    #
+    # Between full rebuilds the table is append-only: postings that vanish
+    # from the feed are tombstoned in `alive` rather than removed, so row
+    # indices stay valid for the index built over the table.
+    __slots__ = (
+        "ids", "titles", "urls", "texts",
+        "company_codes", "companies",
+        "location_codes", "locations",
+        "source_codes", "sources",
+        "alive", "fingerprint",
+    )
+
+    def __init__(self, ids, titles, urls, texts, company_codes, companies,
+                 location_codes, locations, source_codes, sources, alive, fingerprint):
+        self.ids = ids
+        self.titles = titles
+        self.urls = urls
+        self.texts = texts
+        self.company_codes = company_codes
+        self.companies = companies
+        self.location_codes = location_codes
+        self.locations = locations
+        self.source_codes = source_codes
+        self.sources = sources
+        self.alive = alive
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        jobs = list(jobs)
+        texts = [job_text(job) for job in jobs]
+        ids = [str(job.get("id") or job.get("url", "")) for job in jobs]
+        company_codes, companies = intern_column([job.get("company", "") for job in jobs])
+        location_codes, locations = intern_column([job.get("location", "") for job in jobs])
+        source_codes, sources = intern_column([job.get("source", "") for job in jobs])
+        return cls(
+            ids=object_column(ids),
+            titles=object_column([job.get("title", "") for job in jobs]),
+            urls=object_column([job.get("url", "") for job in jobs]),
+            texts=object_column(texts),
+            company_codes=company_codes,
+            companies=companies,
+            location_codes=location_codes,
+            locations=locations,
+            source_codes=source_codes,
+            sources=sources,
+            alive=np.ones(len(jobs), dtype=bool),
+            fingerprint=feed_fingerprint(ids, texts),
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def apply_delta(self, jobs):
+        # Diff the live rows against a newer feed by job id: new postings are
+        # appended, postings missing from the feed are tombstoned. Returns the
+        # new table and the row indices that were appended.
+        live_ids = {self.ids[row]: row for row in np.flatnonzero(self.alive)}
+        feed_ids = set()
+        added = []
+        for job in jobs:
+            job_id = str(job.get("id") or job.get("url", ""))
+            feed_ids.add(job_id)
+            if job_id not in live_ids:
+                added.append(job)
+        removed = [row for job_id, row in live_ids.items() if job_id not in feed_ids]
+        if not added and not removed:
+            return self, np.empty(0, dtype=np.intp)
+
+        delta = JobTable.from_jobs(added)
+        company_codes, companies = intern_column([job.get("company", "") for job in added], self.companies)
+        location_codes, locations = intern_column([job.get("location", "") for job in added], self.locations)
+        source_codes, sources = intern_column([job.get("source", "") for job in added], self.sources)
+        alive = np.concatenate([self.alive, delta.alive])
+        alive[removed] = False
+
+        digest = hashlib.sha1(self.fingerprint.encode())
+        digest.update(delta.fingerprint.encode())
+        digest.update("\0".join(sorted(self.ids[row] for row in removed)).encode("utf-8", "replace"))
+
+        table = JobTable(
+            ids=concat_column(self.ids, delta.ids),
+            titles=concat_column(self.titles, delta.titles),
+            urls=concat_column(self.urls, delta.urls),
+            texts=concat_column(self.texts, delta.texts),
+            company_codes=np.concatenate([self.company_codes, company_codes]),
+            companies=companies,
+            location_codes=np.concatenate([self.location_codes, location_codes]),
+            locations=locations,
+            source_codes=np.concatenate([self.source_codes, source_codes]),
+            sources=sources,
+            alive=alive,
+            fingerprint=digest.hexdigest(),
+        )
+        return table, np.arange(len(self), len(table))
+
+    def compact(self):
+        rows = np.flatnonzero(self.alive)
+        return JobTable(
+            ids=self.ids[rows],
+            titles=self.titles[rows],
+            urls=self.urls[rows],
+            texts=self.texts[rows],
+            company_codes=self.company_codes[rows],
+            companies=self.companies,
+            location_codes=self.location_codes[rows],
+            locations=self.locations,
+            source_codes=self.source_codes[rows],
+            sources=self.sources,
+            alive=np.ones(len(rows), dtype=bool),
+            fingerprint=self.fingerprint,
+        )
+
+    def dead_fraction(self):
+        return 1 - self.alive.mean() if len(self) else 0.0
+
+    def live_jobs(self):
+        # Live rows as normalized jobs with their text, e.g. to bring another
+        # snapshot of the same feed up to date through FeedSnapshot.update
+        for i in np.flatnonzero(self.alive):
+            job = self.row(i)
+            job["text"] = self.texts[i]
+            yield job
+
+    def row(self, i):
+        return {
+            "id": self.ids[i],
+            "title": self.titles[i],
+            "company": self.companies[self.company_codes[i]],
+            "location": self.locations[self.location_codes[i]],
+            "url": self.urls[i],
+            "source": self.sources[self.source_codes[i]],
+        }
+
+
+class StringColumn:
+    # Read-only string column over a UTF-8 blob and an offsets array, both of
+    # which may be memory-mapped. Strings are only decoded when accessed.
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            start, end = self.offsets[key], self.offsets[key + 1]
+            return bytes(self.blob[start:end]).decode("utf-8")
+        return object_column([self[i] for i in np.asarray(key)])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def job_text(job):
+    if "text" in job:
+        return job["text"]
+    return clean_text(job.get("title", "") + " " + job.get("description", ""))
+
+
+def object_column(values):
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def concat_column(column, values):
+    return np.concatenate([object_column(list(column)), values])
+
+
+def intern_column(values, lookup=()):
+    codes = {value: code for code, value in enumerate(lookup)}
+    column = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        column[i] = codes.setdefault(sys.intern(value), len(codes))
+    return column, list(codes)
+
+
+def feed_fingerprint(ids, texts):
+    digest = hashlib.sha1()
+    for job_id, text in zip(ids, texts):
+        digest.update(f"{job_id}\0{text}\0".encode("utf-8", "replace"))
+    return digest.hexdigest()
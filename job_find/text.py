@@ -0,0 +1,29 @@
+import html
+import re
+import unicodedata
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]*>")
+HTML_SKIP_PATTERN = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def html_to_text(markup):
+    if "<" in markup:
+        markup = HTML_SKIP_PATTERN.sub(" ", markup)
+        markup = HTML_TAG_PATTERN.sub(" ", markup)
+    if "&" in markup:
+        markup = html.unescape(markup)
+    return " ".join(markup.split())
+
+
+def clean_text(text, markup=False):
+    # Normal form everything downstream (fingerprints, indexes, filters)
+    # works on: NFKC-normalized, lowercase, single-spaced. Only raw markup
+    # (markup=True) has its tags stripped and entities unescaped; doing that
+    # to plain text would eat a literal "a < b" or "vector<T>".
+    text = unicodedata.normalize("NFKC", text)
+    text = html_to_text(text) if markup else " ".join(text.split())
+    return text.lower()
+
+
+def tokenize(text):
+    return re.findall(r"\w+", text.lower())
@@ -0,0 +1,49 @@
+import functools
+import threading
+from collections import OrderedDict
+
+from .metrics import count
+
+
+class LRUCache:
+    def __init__(self, maxsize, name=None):
+        # A named cache reports <name>_cache_hit / _miss counters
+        self.maxsize = maxsize
+        self.name = name
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                value = None
+            else:
+                self.entries.move_to_end(key)
+                value = self.entries[key]
+        if self.name:
+            count(f"{self.name}_cache_{'miss' if value is None else 'hit'}")
+        return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+def once(func):
+    # Process-wide lazily created resource (pools, sessions, fitted models)
+    lock = threading.Lock()
+    result = []
+
+    @functools.wraps(func)
+    def wrapper():
+        if not result:
+            with lock:
+                if not result:
+                    result.append(func())
+        return result[0]
+
+    wrapper.clear = result.clear
+    return wrapper
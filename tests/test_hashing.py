@@ -0,0 +1,24 @@
+import numpy as np
+
+from job_find.hashing import HashingFeatures
+
+
+def test_idf_cached_until_partial_fit():
+    features = HashingFeatures(n_features=2**10)
+    features.fit_transform(["python developer", "react developer"])
+    idf = features.idf()
+    assert features.idf() is idf
+
+    features.partial_fit(features.counts(["python engineer"]))
+    assert features.idf() is not idf
+    assert features.n_docs == 3
+    assert np.isclose(features.idf().min(), np.log(4 / 3) + 1)
+
+
+def test_copy_does_not_share_frequencies():
+    features = HashingFeatures(n_features=2**10)
+    features.fit_transform(["python developer"])
+    copy = features.copy()
+    copy.partial_fit(copy.counts(["python developer"]))
+    assert features.n_docs == 1 and features.df.max() == 1
+    assert copy.n_docs == 2 and copy.df.max() == 2
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from job_find.config import MATCHERS
+from job_find.index import FeedSnapshot
+from job_find.matching import match_rows
+from job_find.table import JobTable
+
+TITLES = ["Python Developer", "Data Scientist", "DevOps Engineer", "React Developer", "Product Manager"]
+SKILLS = ["python django", "machine learning pandas", "kubernetes terraform", "react javascript", "roadmap"]
+
+
+def make_jobs(ids):
+    return [
+        {
+            "id": f"stub:{i}",
+            "title": TITLES[i % len(TITLES)],
+            "company": f"Company {i % 7}",
+            "location": "Worldwide",
+            "url": f"https://jobs.example/{i}",
+            "text": f"{TITLES[i % len(TITLES)].lower()} {SKILLS[i % len(SKILLS)]} remote team {i}",
+            "source": "stub",
+        }
+        for i in ids
+    ]
+
+
+@pytest.mark.parametrize("kind", MATCHERS)
+def test_update_remove_only(kind):
+    snapshot = FeedSnapshot.build(JobTable.from_jobs(make_jobs(range(200))), kind)
+    updated = snapshot.update(make_jobs(range(20, 200)), kind=kind)
+
+    assert updated.index is snapshot.index
+    assert len(updated.table) == 200
+    assert updated.table.alive.sum() == 180
+    assert not updated.table.alive[:20].any()
+    rows, _ = match_rows(["python"], updated, limit=200)
+    assert len(rows) and updated.table.alive[rows].all()
+
+
+@pytest.mark.parametrize("kind", MATCHERS)
+def test_update_remove_only_compacts(kind):
+    snapshot = FeedSnapshot.build(JobTable.from_jobs(make_jobs(range(200))), kind)
+    updated = snapshot.update(make_jobs(range(100, 200)), kind=kind)
+
+    assert len(updated.table) == 100
+    assert updated.table.alive.all()
+    assert updated.index is not snapshot.index
+
+
+@pytest.mark.parametrize("kind", MATCHERS)
+def test_update_no_change(kind):
+    jobs = make_jobs(range(50))
+    snapshot = FeedSnapshot.build(JobTable.from_jobs(jobs), kind)
+    updated = snapshot.update(jobs, kind=kind)
+
+    assert updated.table is snapshot.table
+    assert updated.index is snapshot.index
+
+
+@pytest.mark.parametrize("kind", MATCHERS)
+def test_update_appends(kind):
+    snapshot = FeedSnapshot.build(JobTable.from_jobs(make_jobs(range(50))), kind)
+    # The numbered tokens of new postings are new words; keep them from
+    # triggering a refit
+    updated = snapshot.update(make_jobs(range(10, 60)), max_drift=1.0, kind=kind)
+
+    assert len(updated.table) == 60
+    assert np.array_equal(np.flatnonzero(~updated.table.alive), np.arange(10))
+    assert updated.index.score("python").shape == (60,)
+
+
+def test_keyword_mask_matches_whole_keyword():
+    jobs = make_jobs(range(3))
+    for job, title in zip(jobs, ["C++ Developer", "Customer Success", ".NET Engineer"]):
+        job["title"] = title
+    jobs += make_jobs(range(3, 6))
+    snapshot = FeedSnapshot.build(JobTable.from_jobs(jobs), "tfidf")
+    titles = snapshot.table.titles
+
+    def matching(*keywords):
+        return list(titles[snapshot.index.keyword_mask(list(keywords), titles)])
+
+    assert matching("c++") == ["C++ Developer"]
+    assert matching(".net") == [".NET Engineer"]
+    assert matching("velop") == ["C++ Developer", "React Developer", "Python Developer"]
+    assert matching("developer", "react") == ["React Developer"]
+    assert matching("rust") == []
+
+
+def test_keyword_mask_single_word_uses_index_only():
+    snapshot = FeedSnapshot.build(JobTable.from_jobs(make_jobs(range(10))), "tfidf")
+
+    class Unread:
+        def __len__(self):
+            return 10
+
+        def __getitem__(self, row):
+            raise AssertionError("title read for a single-word keyword")
+
+    mask = snapshot.index.keyword_mask(["Developer"], Unread())
+    assert np.array_equal(mask, np.array([title.endswith("Developer") for title in snapshot.table.titles]))
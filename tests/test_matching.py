@@ -0,0 +1,67 @@
+import pytest
+
+from job_find.config import MATCHERS
+from job_find.index import FeedSnapshot
+from job_find.matching import batch_match_jobs, semantic_match_jobs
+from job_find.table import JobTable
+
+from test_index import make_jobs
+
+
+def test_semantic_match_jobs_accepts_raw_remotive_jobs():
+    raw = [
+        {
+            "id": 1,
+            "url": "https://remotive.com/remote-jobs/1",
+            "title": "Python Developer",
+            "company_name": "Acme",
+            "candidate_required_location": "Europe",
+            "description": "<p>Python &amp; Django APIs</p>",
+        },
+        {
+            "id": 2,
+            "url": "https://remotive.com/remote-jobs/2",
+            "title": "Product Manager",
+            "company_name": "Initech",
+            "candidate_required_location": "USA",
+            "description": "<p>Roadmaps</p>",
+        },
+    ]
+    best = semantic_match_jobs(["python", "django"], raw)[0]
+    assert (best["title"], best["company"], best["location"]) == ("Python Developer", "Acme", "Europe")
+    assert best["url"] == "https://remotive.com/remote-jobs/1"
+    assert best["score"] > 0 and best["salary"].startswith("$")
+
+
+@pytest.mark.parametrize("kind", MATCHERS)
+def test_batch_match_agrees_with_single_matches(kind):
+    snapshot = FeedSnapshot.build(JobTable.from_jobs(make_jobs(range(120))), kind)
+    # Tombstone some rows, without a refit
+    snapshot = snapshot.update(make_jobs(range(15, 120)), kind=kind)
+    assert not snapshot.table.alive.all()
+    profiles = [
+        ["python", "django"],
+        {"skills": ["react", "javascript"]},
+        ["kubernetes"],
+        ["roadmap", "python"],
+        ["rust"],
+    ]
+
+    def ranked(matches):
+        return sorted((-job["score"], job["id"]) for job in matches)
+
+    # The postings repeat a few texts, so only scores are compared where the
+    # limit cuts through ties
+    for chunk_cells, limit in [(10_000_000, 200), (150, 200), (10_000_000, 10), (150, 10)]:
+        batch = batch_match_jobs(profiles, snapshot, limit=limit, min_score=0.1, chunk_cells=chunk_cells)
+        assert len(batch) == len(profiles) and batch[0]
+        for profile, matches in zip(profiles, batch):
+            skills = profile["skills"] if isinstance(profile, dict) else profile
+            single = semantic_match_jobs(skills, snapshot, limit=limit, min_score=0.1)
+            if limit > len(snapshot.table):
+                assert ranked(matches) == ranked(single)
+            else:
+                assert [job["score"] for job in matches] == [job["score"] for job in single]
+            assert all(job["score"] >= 0.1 for job in matches)
+            assert all(int(job["id"].split(":")[1]) >= 15 for job in matches)
+            assert all(job["salary"].startswith("$") for job in matches)
@@ -0,0 +1,39 @@
+import tracemalloc
+
+from job_find import metrics
+
+
+def test_track_allocations_nests_and_stops():
+    recorder = metrics.begin_request()
+    with metrics.track_allocations():
+        with metrics.track_allocations():
+            assert tracemalloc.is_tracing()
+        assert tracemalloc.is_tracing()
+        with metrics.stage("alloc"):
+            block = bytearray(4 * 2**20)
+    assert not tracemalloc.is_tracing()
+    with metrics.stage("untraced"):
+        pass
+
+    alloc, untraced = recorder.events
+    assert alloc["alloc_peak_bytes"] >= len(block)
+    assert untraced["alloc_peak_bytes"] is None
+
+
+def test_track_allocations_leaves_outside_tracing_on():
+    tracemalloc.start()
+    try:
+        with metrics.track_allocations():
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_stage_unwinds_when_tracing_stops_inside_it():
+    recorder = metrics.begin_request()
+    with metrics.track_allocations():
+        with metrics.stage("outer"):
+            tracemalloc.stop()
+    assert metrics._alloc_frames.get() == ()
+    assert recorder.events[0]["alloc_peak_bytes"] is None
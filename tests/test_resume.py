@@ -0,0 +1,101 @@
+import multiprocessing
+import signal
+import sys
+import time
+
+import pytest
+
+from job_find import resume
+from job_find.bench import synthetic_resume_pdf
+
+
+def test_ingest_single_pdf(tmp_path):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(synthetic_resume_pdf(seed=1))
+    results = list(resume.ingest_resumes(str(path), workers=1))
+    assert [r["file"] for r in results] == [str(path)]
+    assert results[0]["error"] is None
+    assert results[0]["profile"]["experience"] != "Not specified"
+
+
+def test_ingest_rejects_other_files(tmp_path):
+    path = tmp_path / "cv.txt"
+    path.write_text("python")
+    with pytest.raises(ValueError):
+        list(resume.ingest_resumes(str(path), workers=1))
+
+
+_parse_resume_file = resume._parse_resume_file
+
+
+def _stuck(name, source, timeout):
+    # A file the in-worker alarm cannot interrupt
+    signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+    time.sleep(60)
+
+
+def _stuck_on_bad(name, source, timeout):
+    if "bad" in name:
+        _stuck(name, source, timeout)
+    return _parse_resume_file(name, source, timeout)
+
+
+def write_resumes(directory, count):
+    for i in range(count):
+        (directory / f"cv{i}.pdf").write_bytes(synthetic_resume_pdf(seed=i))
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="needs fork-started workers")
+def test_ingest_terminates_stalled_workers(tmp_path, monkeypatch):
+    (tmp_path / "cv.pdf").write_bytes(b"%PDF-1.4")
+    monkeypatch.setattr(resume, "_parse_resume_file", _stuck)
+
+    started = time.monotonic()
+    results = list(resume.ingest_resumes(str(tmp_path), workers=1, timeout=0.2))
+    assert [r["error"] for r in results] == ["timed out after 0.2s"]
+    assert time.monotonic() - started < 10
+    deadline = time.monotonic() + 5
+    while multiprocessing.active_children() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not multiprocessing.active_children()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="needs fork-started workers")
+def test_stalled_worker_does_not_time_out_queued_files(tmp_path, monkeypatch):
+    (tmp_path / "a_bad.pdf").write_bytes(b"%PDF-1.4")
+    write_resumes(tmp_path, 4)
+    monkeypatch.setattr(resume, "_parse_resume_file", _stuck_on_bad)
+
+    results = {r["file"]: r for r in resume.ingest_resumes(str(tmp_path), workers=1, timeout=0.5)}
+    assert results.pop(str(tmp_path / "a_bad.pdf"))["error"] == "timed out after 0.5s"
+    assert len(results) == 4
+    assert all(r["error"] is None and r["profile"] for r in results.values())
+
+
+def test_ingest_without_timeout(tmp_path):
+    write_resumes(tmp_path, 3)
+    results = list(resume.ingest_resumes(str(tmp_path), workers=2, timeout=None))
+    assert len(results) == 3
+    assert all(r["error"] is None for r in results)
+
+
+def test_skill_matcher_respects_word_boundaries():
+    matcher = resume.SkillMatcher(["java", "javascript", "node", "sql", "c++"])
+    assert matcher.find("JavaScript and Node.js on an anode; nosql") == ["javascript", "node"]
+    assert matcher.find("java, javascript") == ["java", "javascript"]
+    assert matcher.find("C++ and c+") == ["c++"]
+    assert not matcher.contains_any("anodes and mysqldump")
+    assert matcher.contains_any("plain SQL")
+
+
+def test_skill_matcher_multiword_counts_and_offsets():
+    matcher = resume.SkillMatcher(["machine learning", "Machine  Learning", "python"])
+    assert matcher.skills == ["machine learning", "python"]
+    text = "Python, machine\n  learning, MACHINE LEARNING and python3"
+    assert matcher.matches(text) == {"python": [0], "machine learning": [8, 28]}
+    assert matcher.counts(text) == {"python": 1, "machine learning": 2}
+    assert matcher.find("machinelearning") == []
+
+
+def test_find_skills_uses_common_skills():
+    assert resume.find_skills("5 years of python, django and react") == ["python", "django", "react"]
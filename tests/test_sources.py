@@ -0,0 +1,133 @@
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from job_find import metrics
+from job_find.sources import JobSource, RemotiveSource, fetch_all_sources
+
+
+def remotive_job(i, url=None):
+    return {
+        "id": i,
+        "url": url or f"https://remotive.com/remote-jobs/{i}",
+        "title": f"Python Developer {i}",
+        "company_name": f"Company {i}",
+        "candidate_required_location": "Worldwide",
+        "description": f"<p>Python &amp; Django #{i}</p>",
+    }
+
+
+@pytest.fixture
+def stub_feed():
+    # Serves a Remotive-shaped feed on localhost, gzipped when asked, with an
+    # optional response delay and ETag revalidation
+    servers = []
+
+    def serve(jobs, delay=0.0, etag=None):
+        body = json.dumps({"job-count": len(jobs), "jobs": jobs}).encode()
+        hits = {"200": 0, "304": 0}
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(delay)
+                if etag and self.headers.get("If-None-Match") == etag:
+                    hits["304"] += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                hits["200"] += 1
+                data = body
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                    data = gzip.compress(body)
+                    self.send_header("Content-Encoding", "gzip")
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/", hits
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def pool():
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def test_fetch_normalizes_jobs(stub_feed):
+    url, _ = stub_feed([remotive_job(1)])
+    (job,) = RemotiveSource(url).fetch()
+    assert job == {
+        "id": "remotive:1",
+        "title": "Python Developer 1",
+        "company": "Company 1",
+        "location": "Worldwide",
+        "url": "https://remotive.com/remote-jobs/1",
+        "description": "Python & Django #1",
+        "source": "remotive",
+    }
+
+
+def test_not_modified_reuses_jobs(stub_feed):
+    url, hits = stub_feed([remotive_job(i) for i in range(3)], etag='"v1"')
+    source = RemotiveSource(url)
+    recorder = metrics.begin_request()
+    first = source.fetch()
+    second = source.fetch()
+
+    assert second is first
+    assert hits == {"200": 1, "304": 1}
+    assert recorder.counters == {"remotive_downloaded": 1, "remotive_not_modified": 1}
+
+
+def test_slow_source_is_skipped_at_its_deadline(stub_feed, pool):
+    fast_url, _ = stub_feed([remotive_job(1)])
+    slow_url, _ = stub_feed([remotive_job(2)], delay=3)
+    sources = [RemotiveSource(slow_url, deadline=0.3), RemotiveSource(fast_url, deadline=5)]
+
+    started = time.monotonic()
+    jobs = fetch_all_sources(sources, pool)
+    assert time.monotonic() - started < 2
+    assert [job["id"] for job in jobs] == ["remotive:1"]
+
+
+def test_failing_source_is_skipped(stub_feed, pool):
+    url, _ = stub_feed([remotive_job(1)])
+    sources = [RemotiveSource("http://127.0.0.1:1/", deadline=2), RemotiveSource(url)]
+    assert [job["id"] for job in fetch_all_sources(sources, pool)] == ["remotive:1"]
+
+
+def test_merge_drops_duplicate_urls(stub_feed, pool):
+    first_url, _ = stub_feed([remotive_job(1), remotive_job(2)])
+    second_url, _ = stub_feed([remotive_job(3, url="https://remotive.com/remote-jobs/2"), remotive_job(4)])
+    jobs = fetch_all_sources([RemotiveSource(first_url), RemotiveSource(second_url)], pool)
+    assert [job["id"] for job in jobs] == ["remotive:1", "remotive:2", "remotive:4"]
+
+
+def test_incomplete_adapter_fails_on_creation():
+    class NoNormalize(JobSource):
+        def parse(self, res):
+            return []
+
+    with pytest.raises(TypeError):
+        NoNormalize("http://127.0.0.1:1/")
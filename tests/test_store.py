@@ -0,0 +1,95 @@
+import json
+import os
+
+import numpy as np
+
+from job_find import ann, embedding, index as index_module, store as store_module
+from job_find.index import FeedSnapshot
+from job_find.store import FeedRefresher, SnapshotStore, refresh_snapshot
+from job_find.table import JobTable
+
+from test_index import make_jobs
+
+
+def test_ann_round_trip_uses_configured_nprobe(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding, "ANN_MIN_ROWS", 100)
+    store = SnapshotStore(str(tmp_path))
+    store.save(FeedSnapshot.build(JobTable.from_jobs(make_jobs(range(400))), "dense"))
+    loaded = store.load_latest()
+    assert loaded.index.ann is not None
+    extended = loaded.update(make_jobs(range(410)), max_drift=1.0)
+    assert extended.index.ann is not None
+
+    probed = []
+    probe = ann.IVFIndex.probe
+    monkeypatch.setattr(ann.IVFIndex, "probe", lambda self, q, nprobe: probed.append(nprobe) or probe(self, q, nprobe))
+    monkeypatch.setattr(ann, "ANN_NPROBE", 3)
+    mask = np.ones(len(extended.table), dtype=bool)
+    extended.index.candidates("python django", 1, mask, min_score=-1.0)
+    loaded.index.candidates("python django", 1, mask[:400], min_score=-1.0)
+    assert probed == [3, 3]
+
+
+def snapshot_dirs(store):
+    return sorted(name for name in os.listdir(store.directory) if name != "LATEST")
+
+
+def test_unchanged_refresh_only_touches_meta(tmp_path, monkeypatch):
+    jobs = make_jobs(range(50))
+    monkeypatch.setattr(store_module, "fetch_jobs", lambda: jobs)
+    store = SnapshotStore(str(tmp_path))
+    first = refresh_snapshot(store, None, "tfidf")
+    names = snapshot_dirs(store)
+    saved = os.path.join(store.latest_path(), "ids_blob.npy")
+    mtime = os.stat(saved).st_mtime_ns
+
+    loaded = store.load_latest()
+    refreshed = refresh_snapshot(store, loaded, "tfidf")
+    assert refreshed.table is loaded.table
+    assert snapshot_dirs(store) == names
+    assert os.stat(saved).st_mtime_ns == mtime
+    with open(os.path.join(store.latest_path(), "meta.json")) as f:
+        assert json.load(f)["created_at"] == refreshed.created_at > first.created_at
+    assert store.load_latest().created_at == refreshed.created_at
+
+    monkeypatch.setattr(store_module, "fetch_jobs", lambda: make_jobs(range(5, 55)))
+    changed = refresh_snapshot(store, refreshed, "tfidf")
+    assert store.load_latest().table.fingerprint == changed.table.fingerprint != first.table.fingerprint
+
+
+def test_saving_same_rows_under_two_matchers(tmp_path):
+    store = SnapshotStore(str(tmp_path), keep=3)
+    table = JobTable.from_jobs(make_jobs(range(30)))
+    tfidf = FeedSnapshot.build(table, "tfidf")
+    store.save(tfidf)
+    store.save(FeedSnapshot(table, FeedSnapshot.build(table, "hashing").index, tfidf.created_at))
+
+    assert len(snapshot_dirs(store)) == 2
+    assert not [name for name in os.listdir(store.directory) if name.startswith(".")]
+    assert store.load_latest().index.kind == "hashing"
+
+
+def test_refresher_keeps_other_matchers_up_to_date(tmp_path, monkeypatch):
+    monkeypatch.setattr(store_module, "MATCHER", "tfidf")
+    monkeypatch.setattr(store_module, "fetch_jobs", lambda: make_jobs(range(40)))
+    refresher = FeedRefresher(SnapshotStore(str(tmp_path)))
+    try:
+        main = refresher.current()
+        dense = refresher.current("dense")
+        assert (main.index.kind, dense.index.kind) == ("tfidf", "dense")
+        assert refresher.current("dense") is dense
+
+        monkeypatch.setattr(store_module, "fetch_jobs", lambda: make_jobs(range(10, 45)))
+        assert refresher.refresh()
+
+        def no_request_builds(table, kind=None):
+            raise AssertionError(f"{kind} index built in a request")
+
+        monkeypatch.setattr(index_module, "get_job_index", no_request_builds)
+        updated = refresher.current("dense")
+        assert updated.index.kind == "dense"
+        live = {job["id"] for job in updated.table.live_jobs()}
+        assert live == {f"stub:{i}" for i in range(10, 45)}
+        assert refresher.current().table is not main.table
+    finally:
+        refresher.stop()
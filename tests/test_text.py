@@ -0,0 +1,18 @@
+from job_find.sources import RemotiveSource, prepare_jobs
+from job_find.text import clean_text
+
+
+def test_clean_text_keeps_plain_text_literals():
+    assert clean_text("Write  C++ where a < b and\nvector<T>") == "write c++ where a < b and vector<t>"
+    assert clean_text("ｆｕｌｌ-width Ｐython") == "full-width python"
+
+
+def test_clean_text_strips_markup():
+    assert clean_text("<p>Tom &amp; Jerry</p><script>x()</script>", markup=True) == "tom & jerry"
+
+
+def test_remotive_entities_unescaped_once():
+    job = RemotiveSource(url=None).normalize(
+        {"id": 1, "title": "C++ Developer", "description": "<p>a &lt; b and c &gt; d, vector&lt;T&gt;</p>"}
+    )
+    assert prepare_jobs([job])[0]["text"] == "c++ developer a < b and c > d, vector<t>"